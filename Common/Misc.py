@@ -10,10 +10,9 @@
 #
 import string
 import re
-from random import sample
-import uuid
-import subprocess
+import sys
 from collections import OrderedDict
+from functools import lru_cache
 
 import Common.LongFilePathOs as os
 from Common import EdkLogger as EdkLogger
@@ -53,6 +52,24 @@ from CommonDataClass.Exceptions import BadExpression
 import struct
 
 StructPattern = re.compile(r'[_a-zA-Z][0-9A-Za-z_]*$')
+## Regular expression for a (unicode) string value, with or without '|' in it
+CStringPattern = re.compile(r'\s*L?\".*\"\s*$')
+PtrValuePattern = re.compile(r'^\s*L?\".*\|.*\"')
+## Regular expression for the chars AnalyzePcdExpression tracks, an escaped quote is matched as a whole
+PcdScanPattern = re.compile(r'\\[\'"]|[\'"()|]')
+## Regular expression for an escape sequence in a string or char literal
+EscapeSeqPattern = re.compile(r'\\.', re.DOTALL)
+## Stands in for an escaped backslash while scanning, a private use char never found in meta files
+EscapedBackslashMark = '\uE000'
+
+## Translation tables dropping the braces, spaces (and ';') around GUID C structure values
+GuidStripTable = str.maketrans('', '', '{} ;')
+GuidValueNameStripTable = str.maketrans('', '', '{} ')
+
+## Chars allowed in the string value of a VOID* PCD
+PcdPrintSet = frozenset(string.printable).difference(TAB_PRINTCHAR_VT).union((TAB_PRINTCHAR_BS, TAB_PRINTCHAR_NUL))
+PcdPrintList = sorted(PcdPrintSet)
+PcdPrintBytes = ''.join(PcdPrintList).encode('ascii')
 
 ## Convert GUID string in xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx style to C structure style
 #
@@ -62,14 +79,20 @@ StructPattern = re.compile(r'[_a-zA-Z][0-9A-Za-z_]*$')
 #
 def GuidStringToGuidStructureString(Guid):
     GuidList = Guid.split('-')
-    Result = '{'
-    for Index in range(0, 3, 1):
-        Result = Result + '0x' + GuidList[Index] + ', '
-    Result = Result + '{0x' + GuidList[3][0:2] + ', 0x' + GuidList[3][2:4]
-    for Index in range(0, 12, 2):
-        Result = Result + ', 0x' + GuidList[4][Index:Index + 2]
-    Result += '}}'
-    return Result
+    Data4 = GuidList[4]
+    return '{0x%s, 0x%s, 0x%s, {0x%s, 0x%s, 0x%s, 0x%s, 0x%s, 0x%s, 0x%s, 0x%s}}' % (
+            GuidList[0],
+            GuidList[1],
+            GuidList[2],
+            GuidList[3][0:2],
+            GuidList[3][2:4],
+            Data4[0:2],
+            Data4[2:4],
+            Data4[4:6],
+            Data4[6:8],
+            Data4[8:10],
+            Data4[10:12]
+            )
 
 ## Convert GUID structure in byte array to xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx
 #
@@ -78,32 +101,16 @@ def GuidStringToGuidStructureString(Guid):
 #   @retval     string      The GUID value in xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx format
 #
 def GuidStructureByteArrayToGuidString(GuidValue):
-    guidValueString = GuidValue.lower().replace("{", "").replace("}", "").replace(" ", "").replace(";", "")
+    guidValueString = GuidValue.translate(GuidStripTable)
     guidValueList = guidValueString.split(",")
     if len(guidValueList) != 16:
         return ''
         #EdkLogger.error(None, None, "Invalid GUID value string %s" % GuidValue)
     try:
-        return "%02x%02x%02x%02x-%02x%02x-%02x%02x-%02x%02x-%02x%02x%02x%02x%02x%02x" % (
-                int(guidValueList[3], 16),
-                int(guidValueList[2], 16),
-                int(guidValueList[1], 16),
-                int(guidValueList[0], 16),
-                int(guidValueList[5], 16),
-                int(guidValueList[4], 16),
-                int(guidValueList[7], 16),
-                int(guidValueList[6], 16),
-                int(guidValueList[8], 16),
-                int(guidValueList[9], 16),
-                int(guidValueList[10], 16),
-                int(guidValueList[11], 16),
-                int(guidValueList[12], 16),
-                int(guidValueList[13], 16),
-                int(guidValueList[14], 16),
-                int(guidValueList[15], 16)
-                )
+        Data1, Data2, Data3, Data4 = struct.unpack('<IHH8s', bytes(int(Byte, 16) for Byte in guidValueList))
     except:
         return ''
+    return "%08x-%04x-%04x-%s-%s" % (Data1, Data2, Data3, Data4[:2].hex(), Data4[2:].hex())
 
 ## Convert GUID string in C structure style to xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx
 #
@@ -111,30 +118,23 @@ def GuidStructureByteArrayToGuidString(GuidValue):
 #
 #   @retval     string      The GUID value in xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx format
 #
+@lru_cache(maxsize=2048)
 def GuidStructureStringToGuidString(GuidValue):
+    # a C structure GUID has exactly 11 fields, don't bother the regex with anything else
+    if GuidValue.count(',') != 10:
+        return ''
     if not GlobalData.gGuidCFormatPattern.match(GuidValue):
         return ''
-    guidValueString = GuidValue.lower().replace("{", "").replace("}", "").replace(" ", "").replace(";", "")
+    guidValueString = GuidValue.translate(GuidStripTable)
     guidValueList = guidValueString.split(",")
     if len(guidValueList) != 11:
         return ''
         #EdkLogger.error(None, None, "Invalid GUID value string %s" % GuidValue)
     try:
-        return "%08x-%04x-%04x-%02x%02x-%02x%02x%02x%02x%02x%02x" % (
-                int(guidValueList[0], 16),
-                int(guidValueList[1], 16),
-                int(guidValueList[2], 16),
-                int(guidValueList[3], 16),
-                int(guidValueList[4], 16),
-                int(guidValueList[5], 16),
-                int(guidValueList[6], 16),
-                int(guidValueList[7], 16),
-                int(guidValueList[8], 16),
-                int(guidValueList[9], 16),
-                int(guidValueList[10], 16)
-                )
+        GuidHex = struct.pack('>IHH8B', *[int(Field, 16) for Field in guidValueList]).hex()
     except:
         return ''
+    return '-'.join((GuidHex[0:8], GuidHex[8:12], GuidHex[12:16], GuidHex[16:20], GuidHex[20:32]))
 
 ## Convert GUID string in C structure style to xxxxxxxx_xxxx_xxxx_xxxx_xxxxxxxxxxxx
 #
@@ -143,7 +143,7 @@ def GuidStructureStringToGuidString(GuidValue):
 #   @retval     string      The GUID value in xxxxxxxx_xxxx_xxxx_xxxx_xxxxxxxxxxxx format
 #
 def GuidStructureStringToGuidValueName(GuidValue):
-    guidValueString = GuidValue.lower().replace("{", "").replace("}", "").replace(" ", "")
+    guidValueString = GuidValue.translate(GuidValueNameStripTable)
     guidValueList = guidValueString.split(",")
     if len(guidValueList) != 11:
         EdkLogger.error(None, FORMAT_INVALID, "Invalid GUID value string [%s]" % GuidValue)
@@ -161,44 +161,55 @@ def GuidStructureStringToGuidValueName(GuidValue):
             int(guidValueList[10], 16)
             )
 
+## Convert GUID string in xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx style to its integer value
+#
+#   @param      Guid    The GUID string
+#
+#   @retval     int     The GUID value, in little endian byte order like in the C structure
+#
+@lru_cache(maxsize=2048)
+def GuidStringToGuidInt(Guid):
+    import uuid
+    return int.from_bytes(uuid.UUID(Guid).bytes_le, 'little')
+
 def AnalyzePcdExpression(Setting):
-    RanStr = ''.join(sample(string.ascii_letters + string.digits, 8))
-    Setting = Setting.replace('\\\\', RanStr).strip()
+    Setting = Setting.strip()
+    # Without strings or parentheses every '|' is a field separator
+    if '"' not in Setting and "'" not in Setting and '(' not in Setting:
+        return [Field.strip() for Field in Setting.split(TAB_VALUE_SPLIT)]
+    HasEscape = '\\\\' in Setting
+    if HasEscape:
+        Setting = Setting.replace('\\\\', EscapedBackslashMark)
     # There might be escaped quote in a string: \", \\\" , \', \\\'
-    Data = Setting
-    # There might be '|' in string and in ( ... | ... ), replace it with '-'
-    NewStr = ''
+    # There might be '|' in string and in ( ... | ... ), don't split on it
+    FieldList = []
+    StartPos = 0
     InSingleQuoteStr = False
     InDoubleQuoteStr = False
     Pair = 0
-    for Index, ch in enumerate(Data):
-        if ch == '"' and not InSingleQuoteStr:
-            if Data[Index - 1] != '\\':
+    for Match in PcdScanPattern.finditer(Setting):
+        ch = Match.group()
+        if ch == '"':
+            if not InSingleQuoteStr:
                 InDoubleQuoteStr = not InDoubleQuoteStr
-        elif ch == "'" and not InDoubleQuoteStr:
-            if Data[Index - 1] != '\\':
+        elif ch == "'":
+            if not InDoubleQuoteStr:
                 InSingleQuoteStr = not InSingleQuoteStr
-        elif ch == '(' and not (InSingleQuoteStr or InDoubleQuoteStr):
-            Pair += 1
-        elif ch == ')' and not (InSingleQuoteStr or InDoubleQuoteStr):
-            Pair -= 1
-
-        if (Pair > 0 or InSingleQuoteStr or InDoubleQuoteStr) and ch == TAB_VALUE_SPLIT:
-            NewStr += '-'
-        else:
-            NewStr += ch
-    FieldList = []
-    StartPos = 0
-    while True:
-        Pos = NewStr.find(TAB_VALUE_SPLIT, StartPos)
-        if Pos < 0:
-            FieldList.append(Setting[StartPos:].strip())
-            break
-        FieldList.append(Setting[StartPos:Pos].strip())
-        StartPos = Pos + 1
-    for i, ch in enumerate(FieldList):
-        if RanStr in ch:
-            FieldList[i] = ch.replace(RanStr,'\\\\')
+        elif ch == '(':
+            if not (InSingleQuoteStr or InDoubleQuoteStr):
+                Pair += 1
+        elif ch == ')':
+            if not (InSingleQuoteStr or InDoubleQuoteStr):
+                Pair -= 1
+        elif ch == TAB_VALUE_SPLIT:
+            if not (Pair > 0 or InSingleQuoteStr or InDoubleQuoteStr):
+                FieldList.append(Setting[StartPos:Match.start()].strip())
+                StartPos = Match.end()
+    FieldList.append(Setting[StartPos:].strip())
+    if HasEscape:
+        for i, ch in enumerate(FieldList):
+            if EscapedBackslashMark in ch:
+                FieldList[i] = ch.replace(EscapedBackslashMark, '\\\\')
     return FieldList
 
 def ParseFieldValue (Value):
@@ -206,6 +217,7 @@ def ParseFieldValue (Value):
         if '\\' in Value:
             Value.replace('\\', '/').replace(' ', '')
 
+        import subprocess
         Cmd = 'DevicePath ' + '"' + Value + '"'
         try:
             p = subprocess.Popen(Cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True)
@@ -230,118 +242,142 @@ def ParseFieldValue (Value):
     if not isinstance(Value, type('')):
         raise BadExpression('Type %s is %s' %(Value, type(Value)))
     Value = Value.strip()
-    if Value.startswith(TAB_UINT8) and Value.endswith(')'):
-        Value, Size = ParseFieldValue(Value.split('(', 1)[1][:-1])
-        if Size > 1:
-            raise BadExpression('Value (%s) Size larger than %d' %(Value, Size))
-        return Value, 1
-    if Value.startswith(TAB_UINT16) and Value.endswith(')'):
-        Value, Size = ParseFieldValue(Value.split('(', 1)[1][:-1])
-        if Size > 2:
-            raise BadExpression('Value (%s) Size larger than %d' %(Value, Size))
-        return Value, 2
-    if Value.startswith(TAB_UINT32) and Value.endswith(')'):
-        Value, Size = ParseFieldValue(Value.split('(', 1)[1][:-1])
-        if Size > 4:
-            raise BadExpression('Value (%s) Size larger than %d' %(Value, Size))
-        return Value, 4
-    if Value.startswith(TAB_UINT64) and Value.endswith(')'):
-        Value, Size = ParseFieldValue(Value.split('(', 1)[1][:-1])
-        if Size > 8:
-            raise BadExpression('Value (%s) Size larger than %d' % (Value, Size))
-        return Value, 8
-    if Value.startswith(TAB_GUID) and Value.endswith(')'):
-        Value = Value.split('(', 1)[1][:-1].strip()
-        if Value[0] == '{' and Value[-1] == '}':
-            TmpValue = GuidStructureStringToGuidString(Value)
-            if not TmpValue:
-                raise BadExpression("Invalid GUID value string %s" % Value)
-            Value = TmpValue
-        if Value[0] == '"' and Value[-1] == '"':
-            Value = Value[1:-1]
-        try:
-            Value = uuid.UUID(Value).bytes_le
-            ValueL, ValueH = struct.unpack('2Q', Value)
-            Value = (ValueH << 64 ) | ValueL
+    if Value.startswith('DEVICE_PATH(') and Value.endswith(')'):
+        Value = Value.replace("DEVICE_PATH(", '').rstrip(')')
+        Value = Value.strip().strip('"')
+        return ParseDevPathValue(Value)
+    return _ParseFieldValue(Value)
 
-        except ValueError as Message:
-            raise BadExpression(Message)
-        return Value, 16
+## Translate the escape characters in a quoted string or char literal
+#
+#   @param      Value   The literal, with its quotes
+#
+#   @retval     string  The literal text, or the text between the quotes as is if its escapes are invalid
+#
+def UnescapeLiteral(Value):
+    Text = Value[1:-1]
+    # an unescaped closing quote inside doesn't make a valid literal
+    if Value[-1] in EscapeSeqPattern.sub('', Text):
+        return Text
+    try:
+        return Text.encode('latin-1', 'backslashreplace').decode('unicode_escape')
+    except UnicodeDecodeError:
+        return Text
+
+def _ParseUintValue(Value):
+    if not Value.endswith(')'):
+        return None
+    for Type, TypeSize in ((TAB_UINT8, 1), (TAB_UINT16, 2), (TAB_UINT32, 4), (TAB_UINT64, 8)):
+        if Value.startswith(Type):
+            Value, Size = ParseFieldValue(Value.split('(', 1)[1][:-1])
+            if Size > TypeSize:
+                raise BadExpression('Value (%s) Size larger than %d' % (Value, Size))
+            return Value, TypeSize
+    return None
+
+def _ParseGuidValue(Value):
+    if not (Value.startswith(TAB_GUID) and Value.endswith(')')):
+        return None
+    Value = Value.split('(', 1)[1][:-1].strip()
+    if Value[0] == '{' and Value[-1] == '}':
+        TmpValue = GuidStructureStringToGuidString(Value)
+        if not TmpValue:
+            raise BadExpression("Invalid GUID value string %s" % Value)
+        Value = TmpValue
+    if Value[0] == '"' and Value[-1] == '"':
+        Value = Value[1:-1]
+    try:
+        Value = GuidStringToGuidInt(Value)
+    except ValueError as Message:
+        raise BadExpression(Message)
+    return Value, 16
+
+def _ParseUnicodeValue(Value):
     if Value.startswith('L"') and Value.endswith('"'):
         # Unicode String
         # translate escape character
         Value = Value[1:]
-        try:
-            Value = eval(Value)
-        except:
-            Value = Value[1:-1]
-        List = list(Value)
-        List.reverse()
-        Value = 0
-        for Char in List:
-            Value = (Value << 16) | ord(Char)
-        return Value, (len(List) + 1) * 2
-    if Value.startswith('"') and Value.endswith('"'):
-        # ASCII String
-        # translate escape character
-        try:
-            Value = eval(Value)
-        except:
-            Value = Value[1:-1]
-        List = list(Value)
-        List.reverse()
-        Value = 0
-        for Char in List:
-            Value = (Value << 8) | ord(Char)
-        return Value, len(List) + 1
+        Value = UnescapeLiteral(Value)
+        Size = (len(Value) + 1) * 2
+        return int.from_bytes(Value.encode('utf-16-le', 'surrogatepass'), 'little'), Size
     if Value.startswith("L'") and Value.endswith("'"):
         # Unicode Character Constant
         # translate escape character
         Value = Value[1:]
-        try:
-            Value = eval(Value)
-        except:
-            Value = Value[1:-1]
-        List = list(Value)
-        if len(List) == 0:
-            raise BadExpression('Length %s is %s' % (Value, len(List)))
-        List.reverse()
-        Value = 0
-        for Char in List:
-            Value = (Value << 16) | ord(Char)
-        return Value, len(List) * 2
-    if Value.startswith("'") and Value.endswith("'"):
-        # Character constant
-        # translate escape character
-        try:
-            Value = eval(Value)
-        except:
-            Value = Value[1:-1]
-        List = list(Value)
-        if len(List) == 0:
-            raise BadExpression('Length %s is %s' % (Value, len(List)))
-        List.reverse()
-        Value = 0
-        for Char in List:
-            Value = (Value << 8) | ord(Char)
-        return Value, len(List)
-    if Value.startswith('{') and Value.endswith('}'):
-        # Byte array
-        Value = Value[1:-1]
-        List = [Item.strip() for Item in Value.split(',')]
-        List.reverse()
-        Value = 0
-        RetSize = 0
-        for Item in List:
-            ItemValue, Size = ParseFieldValue(Item)
-            RetSize += Size
-            for I in range(Size):
-                Value = (Value << 8) | ((ItemValue >> 8 * I) & 0xff)
-        return Value, RetSize
-    if Value.startswith('DEVICE_PATH(') and Value.endswith(')'):
-        Value = Value.replace("DEVICE_PATH(", '').rstrip(')')
-        Value = Value.strip().strip('"')
-        return ParseDevPathValue(Value)
+        Value = UnescapeLiteral(Value)
+        if len(Value) == 0:
+            raise BadExpression('Length %s is %s' % (Value, len(Value)))
+        Size = len(Value) * 2
+        return int.from_bytes(Value.encode('utf-16-le', 'surrogatepass'), 'little'), Size
+    return None
+
+def _ParseStringValue(Value):
+    if not Value.endswith('"'):
+        return None
+    # ASCII String
+    # translate escape character
+    Value = UnescapeLiteral(Value)
+    Size = len(Value) + 1
+    try:
+        return int.from_bytes(Value.encode('latin-1'), 'little'), Size
+    except UnicodeEncodeError:
+        raise BadExpression('Invalid ASCII string %s' % Value)
+
+def _ParseCharValue(Value):
+    if not Value.endswith("'"):
+        return None
+    # Character constant
+    # translate escape character
+    Value = UnescapeLiteral(Value)
+    if len(Value) == 0:
+        raise BadExpression('Length %s is %s' % (Value, len(Value)))
+    Size = len(Value)
+    try:
+        return int.from_bytes(Value.encode('latin-1'), 'little'), Size
+    except UnicodeEncodeError:
+        raise BadExpression('Invalid character constant %s' % Value)
+
+def _ParseByteArrayValue(Value):
+    if not Value.endswith('}'):
+        return None
+    # Byte array
+    Value = Value[1:-1]
+    List = [Item.strip() for Item in Value.split(',')]
+    List.reverse()
+    # the bytes of each item, taken from its low byte up, are shifted in one by
+    # one, so the whole array is the concatenation read as a big endian number
+    Data = bytearray()
+    for Item in List:
+        ItemValue, Size = ParseFieldValue(Item)
+        Data += (ItemValue & ((1 << 8 * Size) - 1)).to_bytes(Size, 'little')
+    return int.from_bytes(Data, 'big'), len(Data)
+
+## Parsers of the field value forms, keyed by the first char of the value
+#
+# A parser returns None if the value turns out not to be in its form, then
+# the value is parsed as a number, a boolean or a plain name.
+#
+_FieldValueParsers = {
+    'U': _ParseUintValue,
+    'G': _ParseGuidValue,
+    'L': _ParseUnicodeValue,
+    '"': _ParseStringValue,
+    "'": _ParseCharValue,
+    '{': _ParseByteArrayValue,
+}
+
+## Parse a stripped field value string other than DEVICE_PATH(...)
+#
+# The result only depends on the string, so it is cached: the same literals
+# (UINT32(0), common GUIDs, byte array items) show up in lots of PCDs.
+#
+@lru_cache(maxsize=8192)
+def _ParseFieldValue (Value):
+    Parser = _FieldValueParsers.get(Value[:1])
+    if Parser:
+        Result = Parser(Value)
+        if Result is not None:
+            return Result
     if Value.lower().startswith('0x'):
         try:
             Value = int(Value, 16)
@@ -387,6 +423,12 @@ def ParseFieldValue (Value):
 #    Index:     The index where PcdValue is in ValueList
 #
 def AnalyzeDscPcd(Setting, PcdType, DataType=''):
+    ValueList, IsValid, Index = _AnalyzeDscPcd(Setting, PcdType, DataType)
+    return list(ValueList), IsValid, Index
+
+## The same PCD settings come up again and again, cache the analysis and hand out copies
+@lru_cache(maxsize=16384)
+def _AnalyzeDscPcd(Setting, PcdType, DataType):
     FieldList = AnalyzePcdExpression(Setting)
 
     IsValid = True
@@ -464,15 +506,18 @@ def AnalyzeDscPcd(Setting, PcdType, DataType=''):
 #  @retval   ValueList: A List contain value, datum type and toke number.
 #
 def AnalyzePcdData(Setting):
+    return list(_AnalyzePcdData(Setting))
+
+@lru_cache(maxsize=16384)
+def _AnalyzePcdData(Setting):
     ValueList = ['', '', '']
 
-    ValueRe = re.compile(r'^\s*L?\".*\|.*\"')
-    PtrValue = ValueRe.findall(Setting)
+    PtrValue = PtrValuePattern.findall(Setting)
 
     ValueUpdateFlag = False
 
     if len(PtrValue) >= 1:
-        Setting = re.sub(ValueRe, '', Setting)
+        Setting = PtrValuePattern.sub('', Setting)
         ValueUpdateFlag = True
 
     TokenList = Setting.split(TAB_VALUE_SPLIT)
@@ -489,25 +534,20 @@ def AnalyzePcdData(Setting):
 #
 def CheckPcdDatum(Type, Value):
     if Type == TAB_VOID:
-        ValueRe = re.compile(r'\s*L?\".*\"\s*$')
         if not (((Value.startswith('L"') or Value.startswith('"')) and Value.endswith('"'))
                 or (Value.startswith('{') and Value.endswith('}')) or (Value.startswith("L'") or Value.startswith("'") and Value.endswith("'"))
                ):
             return False, "Invalid value [%s] of type [%s]; must be in the form of {...} for array"\
                           ", \"...\" or \'...\' for string, L\"...\" or L\'...\' for unicode string" % (Value, Type)
-        elif ValueRe.match(Value):
+        elif CStringPattern.match(Value):
             # Check the chars in UnicodeString or CString is printable
             if Value.startswith("L"):
                 Value = Value[2:-1]
             else:
                 Value = Value[1:-1]
-            Printset = set(string.printable)
-            Printset.remove(TAB_PRINTCHAR_VT)
-            Printset.add(TAB_PRINTCHAR_BS)
-            Printset.add(TAB_PRINTCHAR_NUL)
-            if not set(Value).issubset(Printset):
-                PrintList = sorted(Printset)
-                return False, "Invalid PCD string value of type [%s]; must be printable chars %s." % (Type, PrintList)
+            # all of them are ASCII, anything left after deleting them is not printable
+            if not Value.isascii() or Value.encode('ascii').translate(None, PcdPrintBytes):
+                return False, "Invalid PCD string value of type [%s]; must be printable chars %s." % (Type, PcdPrintList)
     elif Type == 'BOOLEAN':
         if Value not in ['TRUE', 'True', 'true', '0x1', '0x01', '1', 'FALSE', 'False', 'false', '0x0', '0x00', '0']:
             return False, "Invalid value [%s] of type [%s]; must be one of TRUE, True, true, 0x1, 0x01, 1"\
@@ -530,17 +570,29 @@ def CheckPcdDatum(Type, Value):
     return True, ""
 
 def CommonPath(PathList):
-    P1 = min(PathList).split(os.path.sep)
-    P2 = max(PathList).split(os.path.sep)
-    for Index in range(min(len(P1), len(P2))):
-        if P1[Index] != P2[Index]:
+    P1 = min(PathList)
+    P2 = max(PathList)
+    if P1 == P2:
+        return P1
+    P1 = P1.split(os.path.sep)
+    for Index, (Dir1, Dir2) in enumerate(zip(P1, P2.split(os.path.sep))):
+        if Dir1 != Dir2:
             return os.path.sep.join(P1[:Index])
     return os.path.sep.join(P1)
 
+## Intern a string, passing any other value through unchanged
+#
+def _InternStr(Value):
+    return sys.intern(Value) if type(Value) is str else Value
+
 class PathClass(object):
+    __slots__ = ('Arch', 'File', 'Root', 'AlterRoot', 'Path', 'SubDir', 'Name', 'BaseName', 'Ext', 'Dir',
+                 'Type', 'IsBinary', 'Target', 'TagName', 'ToolCode', 'ToolChainFamily', 'OriginalPath',
+                 '_Hash', '_Key')
+
     def __init__(self, File='', Root='', AlterRoot='', Type='', IsBinary=False,
                  Arch='COMMON', ToolChainFamily='', Target='', TagName='', ToolCode=''):
-        self.Arch = Arch
+        self.Arch = _InternStr(Arch)
         self.File = str(File)
         if os.path.isabs(self.File):
             self.Root = ''
@@ -552,7 +604,7 @@ class PathClass(object):
         # Remove any '.' and '..' in path
         if self.Root:
             self.Root = mws.getWs(self.Root, self.File)
-            self.Path = os.path.normpath(os.path.join(self.Root, self.File))
+            self.Path = sys.intern(os.path.normpath(os.path.join(self.Root, self.File)))
             self.Root = os.path.normpath(CommonPath([self.Root, self.Path]))
             # eliminate the side-effect of 'C:'
             if self.Root[-1] == ':':
@@ -563,10 +615,12 @@ class PathClass(object):
             else:
                 self.File = self.Path[len(self.Root) + 1:]
         else:
-            self.Path = os.path.normpath(self.File)
+            self.Path = sys.intern(os.path.normpath(self.File))
 
         self.SubDir, self.Name = os.path.split(self.File)
         self.BaseName, self.Ext = os.path.splitext(self.Name)
+        # a handful of extensions are shared by all the instances
+        self.Ext = sys.intern(self.Ext)
 
         if self.Root:
             if self.SubDir:
@@ -579,14 +633,16 @@ class PathClass(object):
         if IsBinary:
             self.Type = Type
         else:
-            self.Type = self.Ext.lower()
+            self.Type = sys.intern(self.Ext.lower())
 
         self.IsBinary = IsBinary
-        self.Target = Target
-        self.TagName = TagName
-        self.ToolCode = ToolCode
-        self.ToolChainFamily = ToolChainFamily
+        self.Target = _InternStr(Target)
+        self.TagName = _InternStr(TagName)
+        self.ToolCode = _InternStr(ToolCode)
+        self.ToolChainFamily = _InternStr(ToolChainFamily)
         self.OriginalPath = self
+        self._Hash = hash(self.Path)
+        self._Key = None
 
     ## Convert the object of this class to a string
     #
@@ -632,11 +688,13 @@ class PathClass(object):
     # @retval string Key for hash table
     #
     def __hash__(self):
-        return hash(self.Path)
+        return self._Hash
 
     @property
     def Key(self):
-        return self.Path.upper()
+        if self._Key is None:
+            self._Key = self.Path.upper()
+        return self._Key
 
     @property
     def TimeStamp(self):
@@ -701,11 +759,15 @@ class PathClass(object):
                 self.Dir = RealRoot
             self.File = RealFile
             self.Root = RealRoot
-            self.Path = os.path.join(RealRoot, RealFile)
+            self.Path = sys.intern(os.path.join(RealRoot, RealFile))
+            self._Hash = hash(self.Path)
+            self._Key = None
         return ErrorCode, ErrorInfo
 
 
 
+_DictTypes = (dict, OrderedDict)
+
 ## DeepCopy dict/OrderedDict recusively
 #
 #   @param      ori_dict    a nested dict or ordereddict
@@ -714,12 +776,15 @@ class PathClass(object):
 #
 def CopyDict(ori_dict):
     dict_type = ori_dict.__class__
-    if dict_type not in (dict,OrderedDict):
+    if dict_type not in _DictTypes:
         return ori_dict
+    # leaf-only dict, a shallow copy is enough
+    if not any(isinstance(value, _DictTypes) for value in ori_dict.values()):
+        return dict_type(ori_dict)
     new_dict = dict_type()
-    for key in ori_dict:
-        if isinstance(ori_dict[key],(dict,OrderedDict)):
-            new_dict[key] = CopyDict(ori_dict[key])
+    for key, value in ori_dict.items():
+        if isinstance(value, _DictTypes):
+            new_dict[key] = CopyDict(value)
         else:
-            new_dict[key] = ori_dict[key]
+            new_dict[key] = value
     return new_dict
@@ -26,6 +26,9 @@ from Common.MultipleWorkspace import MultipleWorkspace as mws
 
 gHexVerPatt = re.compile('0x[a-f0-9]{4}[a-f0-9]{4}$', re.IGNORECASE)
 gHumanReadableVerPatt = re.compile(r'([1-9][0-9]*|0)\.[0-9]{1,2}$')
+## Longest prefix of a line holding no comment character outside a quoted string; an
+## unterminated quote runs to the end of the line
+gStatementPatt = re.compile(r'''(?:[^"'%s]|"[^"]*"?|'[^']*'?)*''' % re.escape(DataType.TAB_COMMENT_SPLIT))
 
 ## GetSplitValueList
 #
@@ -40,6 +43,12 @@ gHumanReadableVerPatt = re.compile(r'([1-9][0-9]*|0)\.[0-9]{1,2}$')
 # @retval list() A list for splitted string
 #
 def GetSplitValueList(String, SplitTag=DataType.TAB_VALUE_SPLIT, MaxSplit= -1):
+    # nothing to split, whatever quotes or parentheses the string has
+    if SplitTag not in String:
+        return [String.strip()]
+    # without quotes or parentheses every splitter counts, which str.split does in C
+    if len(SplitTag) == 1 and '"' not in String and "'" not in String and '(' not in String and ')' not in String:
+        return [Value.strip() for Value in String.split(SplitTag, MaxSplit if MaxSplit > 0 else -1)]
     ValueList = []
     Last = 0
     Escaped = False
@@ -273,21 +282,26 @@ def ReplaceMacro(String, MacroDefinitions=None, SelfReplacement=False, RaiseErro
     LastString = String
     if MacroDefinitions is None:
         MacroDefinitions = {}
-    while String and MacroDefinitions:
-        MacroUsed = GlobalData.gMacroRefPattern.findall(String)
-        # no macro found in String, stop replacing
-        if len(MacroUsed) == 0:
-            break
+    # nothing to replace in a string without any macro reference
+    if isinstance(String, str) and '$(' not in String:
+        return String
+    # one substitution pass over the string replaces every reference found in it
+    def _ReplaceOne(Match):
+        Macro = Match.group(1)
+        if Macro not in MacroDefinitions:
+            if RaiseError:
+                raise SymbolNotFound("%s not defined" % Macro)
+            if SelfReplacement:
+                return ''
+            return Match.group(0)
+        Value = MacroDefinitions[Macro]
+        # a macro referring to itself is left as it is
+        if Match.group(0) in Value:
+            return Match.group(0)
+        return Value
 
-        for Macro in MacroUsed:
-            if Macro not in MacroDefinitions:
-                if RaiseError:
-                    raise SymbolNotFound("%s not defined" % Macro)
-                if SelfReplacement:
-                    String = String.replace("$(%s)" % Macro, '')
-                continue
-            if "$(%s)" % Macro not in MacroDefinitions[Macro]:
-                String = String.replace("$(%s)" % Macro, MacroDefinitions[Macro])
+    while String and MacroDefinitions:
+        String = GlobalData.gMacroRefPattern.sub(_ReplaceOne, String)
         # in case there's macro not defined
         if String == LastString:
             break
@@ -411,8 +425,24 @@ def CleanString2(Line, CommentCharacter=DataType.TAB_COMMENT_SPLIT, AllowCppStyl
     if AllowCppStyleComment:
         Line = Line.replace(DataType.TAB_COMMENT_EDK_SPLIT, CommentCharacter)
     #
+    # most lines have no comment at all, whatever quotes they hold
+    #
+    if CommentCharacter not in Line:
+        return Line, ''
+    #
+    # without quotes the first comment character starts the comment
+    #
+    if len(CommentCharacter) == 1 and '"' not in Line and "'" not in Line:
+        Line, Sep, Comment = Line.partition(CommentCharacter)
+        return Line.strip(), (Sep + Comment).strip()
+    #
     # separate comments and statements, but we should escape comment character in string
     #
+    if CommentCharacter == DataType.TAB_COMMENT_SPLIT:
+        Index = gStatementPatt.match(Line).end()
+        if Index == len(Line):
+            return Line, ''
+        return Line[0:Index].strip(), Line[Index:].strip()
     InDoubleQuoteString = False
     InSingleQuoteString = False
     CommentInString = False
@@ -34,13 +34,13 @@ class DscSection(object):
 
     def __str__(self):
         sec_strlst = []
-        filter_str = ""
-        if self.filter2.upper() != "COMMON":
-            filter_str = ".".join(self.arch.upper(),self.filter1.upper(),self.filter2.upper())
-        elif self.filter1.upper() != "COMMON":
-            filter_str = ".".join(self.arch.upper(),self.filter1.upper())
-        elif self.arch.upper() != "COMMON":
-            filter_str = self.arch.upper()
+        arch, filter1, filter2 = self.arch.upper(), self.filter1.upper(), self.filter2.upper()
+        if filter2 != "COMMON":
+            filter_str = ".".join((arch, filter1, filter2))
+        elif filter1 != "COMMON":
+            filter_str = ".".join((arch, filter1))
+        elif arch != "COMMON":
+            filter_str = arch
         else:
             filter_str = ""
 
@@ -51,7 +51,10 @@ class DscSection(object):
 
         sec_strlst.append(sec_head_str)
         for key in self.macros:
-            sec_head_str.append("  DEFINE %s = %s" % (key, self.macros[key]))
+            sec_strlst.append("  DEFINE %s = %s" % (key, self.macros[key]))
+        for element in self.data:
+            sec_strlst.append(str(element))
+        return '\r\n'.join(sec_strlst)
 
     def mark_owners(self):
         pass
@@ -77,14 +80,22 @@ class Dsc(object):
         self.dynexhiipcd = DscSection("PcdsDynamicExHii")
         self.dynvpdpcd = DscSection("PcdsDynamicVpd")
         self.dynexvpdpcd = DscSection("PcdsDynamicExVpd")
+        self._defines_map = None
 
         self.inital_dsc()
         
+    ## Get the value of a [Defines] keyword, "" if it is not defined
+    #
+    #   The key -> value map is built from the Defines elements on first use;
+    #   whoever changes self.defines.data afterwards must reset _defines_map.
+    #
     def get_property(self,name):
-        return self.defines.data.get(name,"")
+        if self._defines_map is None:
+            self._defines_map = {element.key: element.value for element in self.defines.data}
+        return self._defines_map.get(name,"")
 
     def inital_dsc(self):
-        pass
+        self._defines_map = None
 
     def format_dsc(self):
         pass
@@ -7,10 +7,23 @@ from Common.MultipleWorkspace import MultipleWorkspace as mws
 import os
 from generators.MedaFileGenerator import DscGen
 
+## Keep the records of each query on a parser, the same model/arch is only filtered once
+class _CachedParser(object):
+    def __init__(self, parser):
+        self._parser = parser
+        self._cache = {}
+
+    def __getitem__(self, key):
+        if key not in self._cache:
+            self._cache[key] = tuple(self._parser[key])
+        return self._cache[key]
+
+    def __getattr__(self, name):
+        return getattr(self._parser, name)
 
 def TestDscParser(dsc_path,WorkspaceDir):
-    dsc_parser = DscParser(PathClass(dsc_path,WorkspaceDir),MODEL_FILE_DSC,"COMMON",
-                                MetaFileStorage(PathClass(dsc_path,WorkspaceDir), MODEL_FILE_DSC))
+    dsc_parser = _CachedParser(DscParser(PathClass(dsc_path,WorkspaceDir),MODEL_FILE_DSC,"COMMON",
+                                MetaFileStorage(PathClass(dsc_path,WorkspaceDir), MODEL_FILE_DSC)))
     
     # '''
     #     ['OvmfPkg/ResetVector/ResetVector.inf', '', '', 'COMMON', 'COMMON', 'COMMON', 474, 584]
@@ -80,8 +93,8 @@ def TestDscParser(dsc_path,WorkspaceDir):
     #     print(item)
 
 def TestInfParser(inf_path,WorkspaceDir):
-    inf_parser = InfParser(PathClass(inf_path,WorkspaceDir),MODEL_FILE_INF,"IA32",
-                                MetaFileStorage(PathClass(inf_path,WorkspaceDir), MODEL_FILE_INF))
+    inf_parser = _CachedParser(InfParser(PathClass(inf_path,WorkspaceDir),MODEL_FILE_INF,"IA32",
+                                MetaFileStorage(PathClass(inf_path,WorkspaceDir), MODEL_FILE_INF)))
     for item in inf_parser[MODEL_META_DATA_HEADER]:
         print(item)
 
@@ -119,8 +132,8 @@ def TestInfParser(inf_path,WorkspaceDir):
         print(item)
 
 def TestDecParser(dec_path,WorkspaceDir):
-    inf_parser = DecParser(PathClass(dec_path,WorkspaceDir),MODEL_FILE_INF,"IA32",
-                                MetaFileStorage(PathClass(dec_path,WorkspaceDir), MODEL_FILE_INF))
+    inf_parser = _CachedParser(DecParser(PathClass(dec_path,WorkspaceDir),MODEL_FILE_INF,"IA32",
+                                MetaFileStorage(PathClass(dec_path,WorkspaceDir), MODEL_FILE_INF)))
     for item in inf_parser[MODEL_META_DATA_HEADER]:
         print(item)
 
@@ -142,7 +155,51 @@ def TestDecParser(dec_path,WorkspaceDir):
     # for item in inf_parser[MODEL_PCD_DYNAMIC]:
     #     print(item)
 
+## BuildOptions as dumped by DscGen before it stored them as rows
+_LEGACY_BUILD_OPTIONS_JSON = '''{"BuildOptions": {"IA32": {"COMMON": {"GCC": {"*_*_*_CC_FLAGS": "-DX", "*_*_*_DLINK_FLAGS": "==/y"}},
+    "DXE_DRIVER": {"MSFT": {"*_*_*_CC_FLAGS": "/D Y"}}}}}'''
+_LEGACY_BUILD_OPTIONS_YAML = '''!!python/object/apply:collections.OrderedDict
+- - - BuildOptions
+    - !!python/object/apply:collections.OrderedDict
+      - - - IA32
+          - !!python/object/apply:collections.OrderedDict
+            - - - COMMON
+                - !!python/object/apply:collections.OrderedDict
+                  - - - GCC
+                      - !!python/object/apply:collections.OrderedDict
+                        - - - '*_*_*_CC_FLAGS'
+                            - -DX
+                          - - '*_*_*_DLINK_FLAGS'
+                            - ==/y
+              - - DXE_DRIVER
+                - !!python/object/apply:collections.OrderedDict
+                  - - - MSFT
+                      - !!python/object/apply:collections.OrderedDict
+                        - - - '*_*_*_CC_FLAGS'
+                            - /D Y
+'''
+_LEGACY_BUILD_OPTIONS_DSC = '\r\n'.join([
+    '[BuildOptions.IA32]',
+    '  GCC:*_*_*_CC_FLAGS = -DX',
+    '  GCC:*_*_*_DLINK_FLAGS ===/y',
+    '',
+    '[BuildOptions.IA32.EDKII.DXE_DRIVER]',
+    '  MSFT:*_*_*_CC_FLAGS = /D Y',
+    '',
+    ])
+
+def TestDscGenLegacyDump():
+    for load, dump in ((DscGen.from_json, _LEGACY_BUILD_OPTIONS_JSON), (DscGen.from_yaml, _LEGACY_BUILD_OPTIONS_YAML)):
+        dsc_gen = DscGen()
+        load(dsc_gen, dump)
+        assert dsc_gen.FormatDsc() == _LEGACY_BUILD_OPTIONS_DSC
+        # and the dump of the converted content loads back the same
+        reloaded = DscGen()
+        reloaded.from_json(dsc_gen.FormatJson())
+        assert reloaded.FormatDsc() == _LEGACY_BUILD_OPTIONS_DSC
+
 if __name__ == "__main__":
+    TestDscGenLegacyDump()
     WorkspaceDir = r"C:\BobFeng\ToolDev\BobEdk2\edk2"
     GlobalData.gGlobalDefines['WORKSPACE'] = WorkspaceDir
     GlobalData.gWorkspace = WorkspaceDir
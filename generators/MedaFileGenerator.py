@@ -4,13 +4,75 @@
 # Copyright (c) 2012, Intel Corporation. All rights reserved.<BR>
 # SPDX-License-Identifier: BSD-2-Clause-Patent
 #
-from collections import OrderedDict
+from itertools import chain
+from operator import attrgetter
+import json
+import sys
 import CommonDataClass.DataClass as DC
 
+## yaml is only needed for the yaml import/export, load it on first use
+_yaml = None
+_YamlLoader = None
+_YamlDumper = None
+
+## Import yaml and pick the libyaml based safe loader/dumper when it is built in
+#
+#   Dumps made before the content moved to plain dicts tag the mappings as
+#   python OrderedDict objects, which a safe loader rejects; this loader reads
+#   them back as plain dicts. DscGen.from_yaml converts the nested BuildOptions
+#   of such dumps to the rows FormatDsc expects.
+#
+def _get_yaml():
+    global _yaml, _YamlLoader, _YamlDumper
+    if _yaml is None:
+        import yaml
+        try:
+            from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+        except ImportError:
+            from yaml import SafeLoader, SafeDumper
+
+        class Loader(SafeLoader):
+            pass
+
+        def construct_ordered_dict(loader, node):
+            return dict(loader.construct_sequence(node.value[0], deep=True))
+        Loader.add_constructor("tag:yaml.org,2002:python/object/apply:collections.OrderedDict",
+                               construct_ordered_dict)
+        _YamlLoader = Loader
+        _YamlDumper = SafeDumper
+        _yaml = yaml
+    return _yaml
+
+## Field getters for the parser records walked by the DscGen.Set_* methods
+_GetName = attrgetter("Value1")
+_GetNameValue = attrgetter("Value1", "Value2")
+_GetSkuFields = attrgetter("Value1", "Value2", "Value3")
+_GetBuildOptionFields = attrgetter("Value1", "Value2", "Value3", "Scope2")
+
+def _build_option_rows(build_opts):
+    ''' Convert the BuildOptions of older dumps, nested as
+        {Arch: {ModuleType: {ToolChain: {FLAG: Value}}}}, to the
+        [SectionHead, ToolChain, FLAG, Value] rows of DscGen.Set_BuildOptions '''
+    rows = dict()
+    for arch, module_types in build_opts.items():
+        for module_type, toolchains in module_types.items():
+            if module_type == "COMMON":
+                section_head = "[BuildOptions.%s]" % arch
+            else:
+                section_head = "[BuildOptions.%s.EDKII.%s]" % (arch, module_type)
+            for toolchain, flags in toolchains.items():
+                for flag, value in flags.items():
+                    row = rows.get((section_head, toolchain, flag))
+                    if row is None:
+                        rows[(section_head, toolchain, flag)] = [section_head, toolchain, flag, value]
+                    else:
+                        row[3] = value
+    return list(rows.values())
+
 
 class DscGen(object):
     def __init__(self):
-        self.content = OrderedDict()
+        self.content = dict()
         self.txt = ""
         self.tab_sp = "  "
         self.arch_lst = set()
@@ -22,95 +84,96 @@ class DscGen(object):
             dsc_parser_dict.update(dsc_parser)
         else:
             dsc_parser_dict[dsc_parser._Arch] = dsc_parser
-        self.Set_Defines(dsc_parser_dict)
-        self.Set_SkuIds(dsc_parser_dict)
-        self.Set_DefaultStores(dsc_parser_dict)
-        self.Set_Packages(dsc_parser_dict)
-        self.Set_BuildOptions(dsc_parser_dict)
-        self.Set_LibraryClasses(dsc_parser_dict)
+
+        # fetch the records of each scope in one go
+        dsc_parser = dsc_parser_dict.get("COMMON", list(dsc_parser_dict.values())[0])
+        records = dsc_parser.GetMany([DC.MODEL_META_DATA_HEADER, DC.MODEL_EFI_SKU_ID,
+                                      DC.MODEL_EFI_DEFAULT_STORES, DC.MODEL_META_DATA_PACKAGE])
+        records.update(dsc_parser.GetMany([DC.MODEL_META_DATA_DEFINE, DC.MODEL_META_DATA_GLOBAL_DEFINE], "COMMON", "COMMON"))
+        arch_records = dict()
+        for arch in dsc_parser_dict:
+            arch_records[arch] = dsc_parser_dict[arch].GetMany([DC.MODEL_META_DATA_BUILD_OPTION, DC.MODEL_EFI_LIBRARY_CLASS], arch)
+
+        # the records are in memory already, so the Set_* calls below are pure
+        # python work under the GIL and gain nothing from running on threads
+        self.Set_Defines(records)
+        self.Set_SkuIds(records)
+        self.Set_DefaultStores(records)
+        self.Set_Packages(records)
+        self.Set_BuildOptions(arch_records)
+        self.Set_LibraryClasses(arch_records)
     
     def from_yaml(self, yaml_content):
         ''' Import the yaml_content into dict'''
-        import yaml
-        self.content = yaml.load(yaml_content)
+        self._set_content(_get_yaml().load(yaml_content, Loader=_YamlLoader))
     
     def from_json(self, json_content):
         ''' Import the json_content into dict'''
-        import json
-        self.content = json.loads(json_content)
+        self._set_content(json.loads(json_content))
+
+    def _set_content(self, content):
+        ''' Keep the imported content, with the BuildOptions of older dumps converted to rows '''
+        build_opts = content.get("BuildOptions")
+        if isinstance(build_opts, dict):
+            content["BuildOptions"] = _build_option_rows(build_opts)
+        self.content = content
 
     def FormatDsc(self):
-        self.txt += str(Sec_Defines(self.content.get("Defines")))
-        self.txt += str(Sec_SkuIds(self.content.get("SkuIds")))
-        self.txt += str(Sec_DefaultStores(self.content.get("DefaultStores")))
-        self.txt += str(Sec_Packages(self.content.get("Packages")))
-        self.txt += str(Sec_PcdsFeatureFlag(self.content.get("PcdsFeatureFlag")))
-        self.txt += str(Sec_PcdsFixedAtBuild(self.content.get("PcdsFixedAtBuild")))
-        self.txt += str(Sec_BuildOptions(self.content.get("BuildOptions")))
-        self.txt += str(Sec_Components(self.content.get("Components")))
-        self.txt += str(Sec_LibraryClasses(self.content.get("LibraryClasses")))
-        self.txt += str(Sec_PcdsPatchableInModule(self.content.get("PcdspatchableInModule")))
-        self.txt += str(Sec_PcdsDynamicDefault(self.content.get("PcdsDynamicDefault")))
-        self.txt += str(Sec_PcdsDynamicExDefault(self.content.get("PcdsDynamicExDefault")))
-        self.txt += str(Sec_PcdsDynamicHii(self.content.get("PcdsDynamicHii")))
-        self.txt += str(Sec_PcdsDynamicExHii(self.content.get("PcdsDynamicExHii")))
-        self.txt += str(Sec_PcdsDynamicVpd(self.content.get("PcdsDynamicVpd")))
-        self.txt += str(Sec_PcdsDynamicExVpd(self.content.get("PcdsDynamicExVpd")))
+        sections = []
+        for name, sec_class in DSC_SECTIONS:
+            content = self.content.get(name)
+            if content:
+                sections.append(str(sec_class(content)))
+        self.txt = "".join(sections)
         return self.txt
 
+    def write_dsc(self, fp):
+        ''' Write the DSC text to the file object fp section by section,
+            without building the whole text as FormatDsc does '''
+        for name, sec_class in DSC_SECTIONS:
+            content = self.content.get(name)
+            if content:
+                fp.write(str(sec_class(content)))
+
     def FormatYaml(self):
-        import yaml
-        self.txt = yaml.dump(self.content, default_flow_style=False)
+        self.txt = _get_yaml().dump(self.content, Dumper=_YamlDumper, default_flow_style=False, sort_keys=False)
         return self.txt
 
     def FormatJson(self):
-        import json
         self.txt = json.dumps(self.content,indent=2)
         return self.txt
 
-    def Set_Defines(self,dsc_parser_dict):
-        dsc_parser = dsc_parser_dict.get("COMMON", list(dsc_parser_dict.values())[0])
-        defines_section = OrderedDict()
-        keywords = OrderedDict()
-        macros = OrderedDict()
-        edk_globals = OrderedDict()
-        for item in dsc_parser[DC.MODEL_META_DATA_HEADER]:
-            keywords[item.Value1] = item.Value2
-        for item in dsc_parser[DC.MODEL_META_DATA_DEFINE,"COMMON","COMMON"]:
-            macros[item.Value1] = item.Value2
-        for item in dsc_parser[DC.MODEL_META_DATA_GLOBAL_DEFINE,"COMMON","COMMON"]:
-            edk_globals[item.Value1] = item.Value2
+    def Set_Defines(self,records):
+        defines_section = dict()
+        keywords = dict(map(_GetNameValue, records[DC.MODEL_META_DATA_HEADER]))
+        macros = dict(map(_GetNameValue, records[DC.MODEL_META_DATA_DEFINE]))
+        edk_globals = dict(map(_GetNameValue, records[DC.MODEL_META_DATA_GLOBAL_DEFINE]))
         
         defines_section["Defines"] = keywords
         defines_section["Defines"]['DEFINE'] = macros 
         defines_section["Defines"]['EDK_GLOBAL'] = edk_globals
         self.content.update(defines_section)
 
-    def Set_SkuIds(self, dsc_parser_dict):
-        dsc_parser = dsc_parser_dict.get("COMMON", list(dsc_parser_dict.values())[0])
-        skuids = OrderedDict()
-        for item in dsc_parser[DC.MODEL_EFI_SKU_ID]:
-            skuids[item.Value1] = " | ".join((item.Value2, item.Value3)) if item.Value3 else item.Value2
+    def Set_SkuIds(self, records):
+        skuids = dict()
+        for name, value, parent in map(_GetSkuFields, records[DC.MODEL_EFI_SKU_ID]):
+            skuids[name] = " | ".join((value, parent)) if parent else value
 
         self.content.update({"SkuIds":skuids})
 
-    def Set_DefaultStores(self, dsc_parser_dict):
-        dsc_parser = dsc_parser_dict.get("COMMON", list(dsc_parser_dict.values())[0])
-        defaultstores = OrderedDict()
-        for item in dsc_parser[DC.MODEL_EFI_DEFAULT_STORES]:
-            defaultstores[item.Value1] = " | ".join((item.Value2, item.Value3)) if item.Value3 else item.Value2
+    def Set_DefaultStores(self, records):
+        defaultstores = dict()
+        for name, value, parent in map(_GetSkuFields, records[DC.MODEL_EFI_DEFAULT_STORES]):
+            defaultstores[name] = " | ".join((value, parent)) if parent else value
 
         self.content.update({"DefaultStores":defaultstores})
 
-    def Set_Packages(self, dsc_parser_dict):
-        dsc_parser = dsc_parser_dict.get("COMMON", list(dsc_parser_dict.values())[0])
-        packages = []
-        for item in dsc_parser[DC.MODEL_META_DATA_PACKAGE]:
-            packages.append(item.Value1)
+    def Set_Packages(self, records):
+        packages = list(map(_GetName, records[DC.MODEL_META_DATA_PACKAGE]))
 
         self.content.update({"Packages":packages})
 
-    def Set_BuildOptions(self,dsc_parser_dict):
+    def Set_BuildOptions(self,arch_records):
         '''
         row = [
             ToolChain,
@@ -123,47 +186,30 @@ class DscGen(object):
             LineNum
         ]
         '''
-        build_opts = OrderedDict()
+        build_opts = dict()
         '''
         build_opts:
-            Arch1:
-                ModuleType1:
-                    ToolChain1:
-                        FLAG_1:
-                            Value_1
-                        FLAG_2:
-                            Value_2
-                    ToolChain2:
-                        FLAG_3:
-                            Value_3
-                ModuleType2:
-                    ...
-            Arch2:
-                ...
+            (SectionHead, ToolChain, FLAG): [SectionHead, ToolChain, FLAG, Value]
         '''
-        for arch in dsc_parser_dict:
-            dsc_parser = dsc_parser_dict[arch]
-            l_build_opts = OrderedDict()
-            for item in dsc_parser[DC.MODEL_META_DATA_BUILD_OPTION,arch]:
-                if not item.Value1:
-                    toolchain = "COMMON"
+        for arch in arch_records:
+            for toolchain, flag, value, module_type in map(_GetBuildOptionFields, arch_records[arch][DC.MODEL_META_DATA_BUILD_OPTION]):
+                # the same few heads, tool chains and flags repeat over many rows
+                toolchain = sys.intern(toolchain) if toolchain else "COMMON"
+                flag = sys.intern(flag)
+                if module_type == "COMMON":
+                    section_head = sys.intern("[BuildOptions.%s]" % arch)
                 else:
-                    toolchain = item.Value1
-                module_type = item.Scope2
-                flag = item.Value2
-                flagvalue = item.Value3
-
-                if module_type not in l_build_opts:
-                    l_build_opts[module_type] = OrderedDict()
-                if toolchain not in l_build_opts[module_type]:
-                    l_build_opts[module_type][toolchain] = OrderedDict()
-                l_build_opts[module_type][toolchain][flag] = flagvalue
-
-            build_opts[arch] = l_build_opts
+                    section_head = sys.intern("[BuildOptions.%s.EDKII.%s]" % (arch, module_type))
+                key = (section_head, toolchain, flag)
+                row = build_opts.get(key)
+                if row is None:
+                    build_opts[key] = [section_head, toolchain, flag, value]
+                else:
+                    row[3] = value
 
-        self.content.update({"BuildOptions":build_opts})
+        self.content.update({"BuildOptions":list(build_opts.values())})
 
-    def Set_LibraryClasses(self, dsc_parser_dict):
+    def Set_LibraryClasses(self, arch_records):
         '''
         row = [
             LibraryClass,
@@ -176,7 +222,7 @@ class DscGen(object):
             LineNo
         ]
         '''
-        lib_classes = OrderedDict()
+        lib_classes = dict()
         '''
             {
                 Arch:{
@@ -187,19 +233,16 @@ class DscGen(object):
             }
         '''
 
-        for arch in dsc_parser_dict:
-            dsc_parser = dsc_parser_dict[arch]
-            l_lib_class = OrderedDict()
-            for item in dsc_parser[DC.MODEL_EFI_LIBRARY_CLASS,arch]:
+        for arch in arch_records:
+            l_lib_class = dict()
+            for item in arch_records[arch][DC.MODEL_EFI_LIBRARY_CLASS]:
                 m_arch = item.Scope1
                 module_t = item.Scope2
                 libclass = item.Value1
                 libIns = item.Value2
-                if module_t not in l_lib_class:
-                    l_lib_class[module_t] = OrderedDict()
-                l_lib_class[module_t][libclass] = libIns
+                l_lib_class.setdefault(module_t, dict())[libclass] = libIns
 
-                lib_classes.setdefault(m_arch,OrderedDict()).update(l_lib_class)
+                lib_classes.setdefault(m_arch,dict()).update(l_lib_class)
 
         self.content.update({"LibraryClasses":lib_classes})
 
@@ -213,6 +256,8 @@ class Sec_Defines(object):
 #
 ################################################################################
 '''
+    __slots__ = ("keywords", "macros", "edk_globals", "tab_sp")
+
     def __init__(self, content):
         self.keywords = content
         self.macros = content.get("DEFINE",{})
@@ -227,24 +272,22 @@ class Sec_Defines(object):
         def_len = len(self.DEFINE_STR) + 1
         glo_len = len(self.EDK_GLOBAL_STR) + 1
 
-        key_str_width = max(
-            [
-                max([len(k) for k in self.keywords]),
-                max([len(k) + def_len for k in self.macros]),
-                max([len(k) + glo_len for k in self.edk_globals]),
-            ])
-        for key in self.keywords:
-            if key in ["DEFINE","EDK_GLOBAL"]:
-                continue
-            section_strlst.append(self.tab_sp + "{0:<{width}}".format(key,width=key_str_width) + " = " + self.keywords[key])
+        key_str_width = max(chain(
+            (len(k) for k in self.keywords),
+            (len(k) + def_len for k in self.macros),
+            (len(k) + glo_len for k in self.edk_globals),
+            ))
+        keyword_fmt = (self.tab_sp + "{:<%d} = {}" % key_str_width).format
+        define_fmt = (self.tab_sp + "DEFINE {:<%d} = {}" % (key_str_width - def_len)).format
+        global_fmt = (self.tab_sp + "EDK_GLOBAL {:<%d} = {}" % (key_str_width - glo_len)).format
+        section_strlst.extend(keyword_fmt(key, value) for key, value in self.keywords.items()
+                              if key not in (self.DEFINE_STR, self.EDK_GLOBAL_STR))
 
         section_strlst.append("")
-        for key in self.macros:
-            section_strlst.append(self.tab_sp + "DEFINE {0:<{width}}".format(key,width = key_str_width - def_len) + " = " + self.macros[key])
+        section_strlst.extend(define_fmt(key, value) for key, value in self.macros.items())
 
         section_strlst.append("")
-        for key in self.edk_globals:
-            section_strlst.append(self.tab_sp + "EDK_GLOBAL {0:<{width}}".format(key,width = key_str_width - glo_len) + " = " + self.edk_globals[key])
+        section_strlst.extend(global_fmt(key, value) for key, value in self.edk_globals.items())
 
         section_strlst.append("")
         return '\r\n'.join(section_strlst)
@@ -258,98 +301,90 @@ class Sec_SkuIds(object):
 ################################################################################
 '''
 
+    __slots__ = ("skuids", "tab_sp")
+
     def __init__(self, content):
         self.skuids = content
         self.tab_sp = "  "
 
     def __str__(self):
-        section_strlst = []
-        section_strlst.append(self.DESCRIPTION)
-        section_strlst.append("[SkuIds]")
-        for key, value in self.skuids.items():
-            section_strlst.append(self.tab_sp + " | ".join((key,value)))
-
+        if not self.skuids:
+            return ""
+        sp = self.tab_sp
+        section_strlst = [self.DESCRIPTION, "[SkuIds]"]
+        section_strlst.extend(["%s%s | %s" % (sp, key, value) for key, value in self.skuids.items()])
         section_strlst.append('\r\n')
         return '\r\n'.join(section_strlst)
 class Sec_DefaultStores(object):
+    __slots__ = ("defaultstores", "tab_sp")
 
     def __init__(self, content):
         self.defaultstores = content
         self.tab_sp = "  "
 
     def __str__(self):
-        section_strlst = []
-        section_strlst.append("[DefaultStores]")
-        for key, value in self.defaultstores.items():
-            section_strlst.append(self.tab_sp + " | ".join((key,value)))
-
+        if not self.defaultstores:
+            return ""
+        sp = self.tab_sp
+        section_strlst = ["[DefaultStores]"]
+        section_strlst.extend(["%s%s | %s" % (sp, key, value) for key, value in self.defaultstores.items()])
         section_strlst.append('\r\n')
         return '\r\n'.join(section_strlst)
 
 class Sec_Packages(object):
-    
+    __slots__ = ("packages", "tab_sp")
+
     def __init__(self,content):
         self.packages = content
         self.tab_sp = "  "
 
     def __str__(self):
-        section_strlst = []
-        section_strlst.append("[Packages]")
-        for item in self.packages:
-            section_strlst.append(self.tab_sp + item)
-  
+        if not self.packages:
+            return ""
+        sp = self.tab_sp
+        section_strlst = ["[Packages]"]
+        section_strlst.extend([sp + item for item in self.packages])
         section_strlst.append('\r\n')
         return '\r\n'.join(section_strlst)
 
 class Sec_BuildOptions(object):
+    __slots__ = ("buildoptions", "tab_sp")
 
     def __init__(self, content):
         self.buildoptions = content
         self.tab_sp = "  "
 
     def __str__(self):
+        bo = self.buildoptions
+        if not bo:
+            return ""
+        sp = self.tab_sp
         section_strlst = []
-        sections = OrderedDict()
-        for arch in self.buildoptions:
-            for module_type in self.buildoptions[arch]:
-                for toolchain in self.buildoptions[arch][module_type]:
-                    for flag in self.buildoptions[arch][module_type][toolchain]:
-                        flag_value = self.buildoptions[arch][module_type][toolchain][flag]
-                        if module_type == "COMMON":
-                            section_head = "[" + ".".join(("BuildOptions",arch)) + "]"
-                        else:
-                            section_head = "[" + ".".join(("BuildOptions",arch,"EDKII",module_type)) + "]"
-                        if section_head not in sections:
-                            sections[section_head] = OrderedDict()
-                        if toolchain not in sections[section_head]:
-                            sections[section_head][toolchain] = OrderedDict()
-                        sections[section_head][toolchain].update({flag:flag_value})
-        for sec_head in sections:
-            section_strlst.append(sec_head)
-            for toolchain in sections[sec_head]:
-                for flag in sections[sec_head][toolchain]:
-                    flag_value = sections[sec_head][toolchain][flag]
-                    if toolchain == "COMMON":
-                        if flag_value.startswith("="):
-                            section_strlst.append(self.tab_sp + flag + " =" + flag_value)
-                        else:
-                            section_strlst.append(self.tab_sp + flag + " = " + flag_value)
-                    else:
-                        if flag_value.startswith("="):
-                            section_strlst.append(self.tab_sp + toolchain + ":" + flag + " =" + flag_value)
-                        else:
-                            section_strlst.append(self.tab_sp + toolchain + ":" + flag + " = " + flag_value)
-            section_strlst.append("")
+        append = section_strlst.append
+        # sections, and tool chains in a section, keep the order they first show up in,
+        # so bucket the rows by both in one pass instead of sorting them
+        sections = dict()
+        for sec_head, toolchain, flag, flag_value in bo:
+            sections.setdefault(sec_head, dict()).setdefault(toolchain, []).append((flag, flag_value))
+        for sec_head, toolchains in sections.items():
+            append(sec_head)
+            for toolchain, flags in toolchains.items():
+                prefix = sp if toolchain == "COMMON" else "%s%s:" % (sp, toolchain)
+                section_strlst.extend([prefix + flag + (" =" if flag_value[:1] == "=" else " = ") + flag_value
+                                       for flag, flag_value in flags])
+            append("")
 
         return '\r\n'.join(section_strlst)
 
 class Sec_LibraryClasses(object):
+    __slots__ = ("libraryclasses", "tab_sp")
+
     def __init__(self, content):
         self.libraryclasses = content
         self.tab_sp = "  "
     def __str__(self):
         section_strlst = []
-        sections = OrderedDict()
+        sections = dict()
 
         for arch in self.libraryclasses:
             for module_t in self.libraryclasses[arch]:
@@ -362,7 +397,7 @@ class Sec_LibraryClasses(object):
                             sec_head = "[LibraryClasses.COMMON.%s]" % module_t
                     else:
                         sec_head = "[LibraryClasses.%s.%s]" % (arch,module_t)
-                    sections.setdefault(sec_head, OrderedDict())[lib_class] = lib_inst
+                    sections.setdefault(sec_head, dict())[lib_class] = lib_inst
         
         for sec_head in sections:
             section_strlst.append(sec_head)
@@ -374,53 +409,93 @@ class Sec_LibraryClasses(object):
 
 
 class Sec_Components(object):
+    __slots__ = ()
+
     def __init__(self, content):
         ...
     def __str__(self):
         return ""
 
 class Sec_PcdsFeatureFlag(object):
+    __slots__ = ()
+
     def __init__(self, content):
         ...
     def __str__(self):
         return ""
 class Sec_PcdsFixedAtBuild(object):
+    __slots__ = ()
+
     def __init__(self, content):
         ...
     def __str__(self):
         return ""
 class Sec_PcdsPatchableInModule(object):
+    __slots__ = ()
+
     def __init__(self, content):
         ...
     def __str__(self):
         return ""
 class Sec_PcdsDynamicDefault(object):
+    __slots__ = ()
+
     def __init__(self, content):
         ...
     def __str__(self):
         return ""
 class Sec_PcdsDynamicHii(object):
+    __slots__ = ()
+
     def __init__(self, content):
         ...
     def __str__(self):
         return ""
 class Sec_PcdsDynamicVpd(object):
+    __slots__ = ()
+
     def __init__(self, content):
         ...
     def __str__(self):
         return ""
 class Sec_PcdsDynamicExDefault(object):
+    __slots__ = ()
+
     def __init__(self, content):
         ...
     def __str__(self):
         return ""
 class Sec_PcdsDynamicExHii(object):
+    __slots__ = ()
+
     def __init__(self, content):
         ...
     def __str__(self):
         return ""
 class Sec_PcdsDynamicExVpd(object):
+    __slots__ = ()
+
     def __init__(self, content):
         ...
     def __str__(self):
-        return ""
\ No newline at end of file
+        return ""
+
+## Sections in the order FormatDsc emits them, keyed by their name in DscGen.content
+DSC_SECTIONS = (
+    ("Defines", Sec_Defines),
+    ("SkuIds", Sec_SkuIds),
+    ("DefaultStores", Sec_DefaultStores),
+    ("Packages", Sec_Packages),
+    ("PcdsFeatureFlag", Sec_PcdsFeatureFlag),
+    ("PcdsFixedAtBuild", Sec_PcdsFixedAtBuild),
+    ("BuildOptions", Sec_BuildOptions),
+    ("Components", Sec_Components),
+    ("LibraryClasses", Sec_LibraryClasses),
+    ("PcdspatchableInModule", Sec_PcdsPatchableInModule),
+    ("PcdsDynamicDefault", Sec_PcdsDynamicDefault),
+    ("PcdsDynamicExDefault", Sec_PcdsDynamicExDefault),
+    ("PcdsDynamicHii", Sec_PcdsDynamicHii),
+    ("PcdsDynamicExHii", Sec_PcdsDynamicExHii),
+    ("PcdsDynamicVpd", Sec_PcdsDynamicVpd),
+    ("PcdsDynamicExVpd", Sec_PcdsDynamicExVpd),
+)
\ No newline at end of file
@@ -12,7 +12,12 @@
 
 from hashlib import md5
 import re
+import sys
+import bisect
+import weakref
 from collections import defaultdict
+from operator import attrgetter
+from functools import lru_cache
 import Common.GlobalData as GlobalData
 from Common.BuildToolError import (
     FORMAT_INVALID,
@@ -44,10 +49,59 @@ from CommonDataClass.Exceptions import *
 from .MetaFileStore import MetaFileStorage
 from .MetaFileCommentParser import CheckInfComment
 
-## RegEx for finding file versions
-hexVersionPattern = re.compile(r'0[xX][\da-f-A-F]{5,8}')
-decVersionPattern = re.compile(r'\d+\.\d+')
+## RegEx for finding file versions, group 1 matches the hex form and group 2 the major.minor form
+VersionPattern = re.compile(r'(0[xX][\da-f-A-F]{5,8})|(\d+\.\d+)')
+## RegEx for a complete {CODE(...)} value. Its only repeat is one character class run ended
+## by a literal, so a failed match backtracks linearly, and it is only run on lines that
+## hold "{CODE(".
 CODEPattern = re.compile(r"{CODE\([a-fA-F0-9Xx\{\},\s]*\)}")
+## RegEx for a C identifier, checked on the token space GUID and PCD CNames in a DEC
+CNamePattern = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*')
+## RegEx for a leading VOID* string value of a DEC PCD, which may hold "|" characters
+PtrStringPattern = re.compile(r'^\s*L?\".*\|.*\"')
+## The DEC sections which can take the Private tag
+PrivateSections = frozenset([DT.TAB_INCLUDES.upper(), DT.TAB_GUIDS.upper(), DT.TAB_PROTOCOLS.upper(), DT.TAB_PPIS.upper()])
+## Upper case names of the [Defines] sections, as section names are compared
+DecDefinesSection = DT.TAB_DEC_DEFINES.upper()
+DscDefinesSection = DT.TAB_DSC_DEFINES.upper()
+
+## Boolean spellings accepted in PCD values, and the integer each one is stored as
+BoolValueMap = {'True': '1', 'true': '1', 'TRUE': '1', 'False': '0', 'false': '0', 'FALSE': '0'}
+
+## The unsigned integer datum types
+UnsignedDatumTypes = frozenset((DT.TAB_UINT8, DT.TAB_UINT16, DT.TAB_UINT32, DT.TAB_UINT64))
+
+## The fields of a DSC raw table record used by DscParser._PostProcess, fetched in one call
+DscRecordFields = attrgetter('ID', 'Model', 'Value1', 'Value2', 'Value3', 'Scope1', 'Scope2', 'Scope3',
+                             'BelongsToItem', 'FromItem', 'StartLine', 'EndLine')
+
+## Name of a <HeaderFiles> or <Packages> line of a DEC structure PCD
+#
+#   The same header files and packages come up in many structure PCDs, so the names
+#   are cached.
+#
+#   @param      Tag     "<HeaderFiles>" or "<Packages>"
+#   @param      Line    The header file or package line
+#
+@lru_cache(maxsize=4096)
+def StructurePcdItemName(Tag, Line):
+    return Tag + "_" + md5(Line.encode('utf-8')).hexdigest()
+
+## RegEx for a PCD value which is a bare number, boolean or plain string, evaluated without
+## any symbol. A string with a '$' could hold a macro, and one with a '\' an escaped quote.
+PlainPcdValuePattern = re.compile(r'(?:0[xX][0-9a-fA-F]+|[0-9]+|TRUE|FALSE|True|False|true|false|L?"[^"$\\]*")$')
+
+## Evaluate a DEC PCD default value which references no symbol
+#
+#   Many PCDs of a package share defaults such as 0, 0x0, FALSE or L"", so the results
+#   are cached. Values failing to evaluate raise each time.
+#
+#   @param      Value       The default value, matching PlainPcdValuePattern
+#   @param      DatumType   The datum type of the PCD
+#
+@lru_cache(maxsize=2048)
+def EvaluatePlainPcdValue(Value, DatumType):
+    return ValueExpressionEx(Value, DatumType)(True)
 
 ## A decorator used to parse macro definition
 def ParseMacro(Parser):
@@ -93,10 +147,12 @@ def ParseMacro(Parser):
                 if isinstance(self, DecParser):
                     if DC.MODEL_META_DATA_HEADER in self._SectionType:
                         self._FileLocalMacros[Name] = Value
+                        self._FileLocalMacrosVersion += 1
                     else:
                         self._ConstructSectionMacroDict(Name, Value)
                 elif self._SectionType == DC.MODEL_META_DATA_HEADER:
                     self._FileLocalMacros[Name] = Value
+                    self._FileLocalMacrosVersion += 1
                 else:
                     self._ConstructSectionMacroDict(Name, Value)
 
@@ -131,8 +187,9 @@ class MetaFileParser(object):
     # data type (file content) for specific file type
     DataType = {}
 
-    # Parser objects used to implement singleton
-    MetaFiles = {}
+    # Parser objects used to implement singleton, keyed by file path; a parser
+    # nobody refers to any more is dropped instead of being kept for the whole run
+    MetaFiles = weakref.WeakValueDictionary()
 
     ## Factory method
     #
@@ -146,12 +203,12 @@ class MetaFileParser(object):
     #   @param  **kwargs        The specific class related dict parameters
     #
     def __new__(cls, FilePath, *args, **kwargs):
-        if FilePath in cls.MetaFiles:
-            return cls.MetaFiles[FilePath]
-        else:
+        Key = str(FilePath)
+        ParserObject = cls.MetaFiles.get(Key)
+        if ParserObject is None:
             ParserObject = super(MetaFileParser, cls).__new__(cls)
-            cls.MetaFiles[FilePath] = ParserObject
-            return ParserObject
+            cls.MetaFiles[Key] = ParserObject
+        return ParserObject
 
     def GetTableID(self):
         return (10**7)
@@ -178,7 +235,19 @@ class MetaFileParser(object):
         self._Defines = {}
         self._Packages = []
         self._FileLocalMacros = {}
+        # bumped on every change of _FileLocalMacros, see _Macros
+        self._FileLocalMacrosVersion = 0
+        self._MacrosCache = (None, None, None)
+        # (macro dict, {value: value with the macros replaced}), see _ReplaceMacro
+        self._ReplaceMacroMemo = (None, {})
+        # {SectionType: {ScopeKey: {Name: Value}}}
         self._SectionsMacroDict = defaultdict(dict)
+        # bumped on every change of _SectionsMacroDict, see _GetApplicableSectionMacro
+        self._SectionsMacroVersion = 0
+        self._SectionMacroCache = (None, None)
+        self._ScopeKeyCache = (None, 0, ())
+        # scope key -> frozenset of its scopes, for the membership tests on section macros
+        self._ScopeSets = {}
 
         # for recursive parsing
         self._Owner = [Owner]
@@ -211,6 +280,19 @@ class MetaFileParser(object):
     def _Store(self, *Args):
         return self._Table.Insert(*Args)
 
+    ## Store several records in table, each given as the argument tuple of _Store
+    def _StoreMany(self, Rows):
+        return self._Table.InsertMany(Rows)
+
+    ## Bind the section parsers of this class to the parser, for per-line dispatch
+    #
+    #   Model ids are sparse (up to MODEL_EXTERNAL_DEPENDENCY), so this stays a dict.
+    #   It is built per Start() rather than kept on self, which would make a cycle
+    #   between the parser and its bound methods.
+    #
+    def _BindSectionParsers(self):
+        return {Model: Parser.__get__(self) for Model, Parser in self._SectionParser.items()}
+
     ## Virtual method for starting parse
     def Start(self):
         raise NotImplementedError
@@ -238,13 +320,14 @@ class MetaFileParser(object):
         self._Finished = Value
 
     ## Remove records that do not match given Filter Arch
-    def _FilterRecordList(self, RecordList, FilterArch):
-        NewRecordList = []
-        for Record in RecordList:
-            Arch = Record.Scope1
-            if Arch == DT.TAB_ARCH_COMMON or Arch == FilterArch:
-                NewRecordList.append(Record)
-        return NewRecordList
+    #
+    #   A table query for a specific arch already keeps only the records of that arch and
+    #   common ones; ArchQueried tells that RecordList comes from such a query for FilterArch.
+    #
+    def _FilterRecordList(self, RecordList, FilterArch, ArchQueried=False):
+        if ArchQueried and FilterArch is not None and FilterArch != DT.TAB_ARCH_COMMON:
+            return RecordList
+        return [Record for Record in RecordList if Record.Scope1 == DT.TAB_ARCH_COMMON or Record.Scope1 == FilterArch]
 
     ## Use [] style to query data in table, just for readability
     #
@@ -265,7 +348,33 @@ class MetaFileParser(object):
         if not self._PostProcessed:
             self._PostProcess()
 
-        return self._FilterRecordList(self._Table.Query(*DataInfo), DataInfo[1])
+        return self._FilterRecordList(self._Table.Query(*DataInfo), DataInfo[1], True)
+
+    ## Query several data types at once, sharing the same scope
+    #
+    #   ScopeInfo = [scope1(arch), scope2(platform/moduletype)], as for []
+    #
+    #   @retval     A dict of the records of each data type
+    #
+    def GetMany(self, Models, *ScopeInfo):
+        # Parse the file first, if necessary
+        self.StartParse()
+
+        # No specific ARCH or Platform given, use raw data
+        if self._RawTable and (len(ScopeInfo) == 0 or ScopeInfo[0] is None):
+            Table = self._RawTable
+            FilterArch = self._Arch
+            ArchQueried = False
+        else:
+            # Do post-process if necessary
+            if not self._PostProcessed:
+                self._PostProcess()
+            Table = self._Table
+            FilterArch = ScopeInfo[0]
+            ArchQueried = True
+
+        RecordDict = Table.QueryMany(Models, *ScopeInfo)
+        return dict((Model, self._FilterRecordList(RecordDict[Model], FilterArch, ArchQueried)) for Model in RecordDict)
 
     def StartParse(self):
         if not self._Finished:
@@ -296,8 +405,7 @@ class MetaFileParser(object):
         self._ValueList[0:len(TokenList)] = TokenList
         # Don't do macro replacement for dsc file at this point
         if not isinstance(self, DscParser):
-            Macros = self._Macros
-            self._ValueList = [ReplaceMacro(Value, Macros) for Value in self._ValueList]
+            self._ReplaceValueListMacros()
 
     ## Skip unsupported data
     def _Skip(self):
@@ -318,16 +426,18 @@ class MetaFileParser(object):
     def _SectionHeaderParser(self):
         self._Scope = []
         self._SectionName = ''
-        ArchList = set()
-        for Item in GetSplitValueList(self._CurrentLine[1:-1], DT.TAB_COMMA_SPLIT):
+        # section headers hold no quoted or parenthesized parts, so plain splits will do
+        for Item in self._CurrentLine[1:-1].split(DT.TAB_COMMA_SPLIT):
+            Item = Item.strip()
             if Item == '':
                 continue
-            ItemList = GetSplitValueList(Item, DT.TAB_SPLIT, 3)
+            ItemList = [Part.strip() for Part in Item.split(DT.TAB_SPLIT, 3)]
             # different section should not mix in one section
-            if self._SectionName != '' and self._SectionName != ItemList[0].upper():
+            SectionName = ItemList[0].upper()
+            if self._SectionName != '' and self._SectionName != SectionName:
                 EdkLogger.error('Parser', FORMAT_INVALID, "Different section names in the same section",
                                 File=self.MetaFile, Line=self._LineIndex + 1, ExtraData=self._CurrentLine)
-            self._SectionName = ItemList[0].upper()
+            self._SectionName = SectionName
             if self._SectionName in self.DataType:
                 self._SectionType = self.DataType[self._SectionName]
                 # Check if the section name is valid
@@ -346,11 +456,10 @@ class MetaFileParser(object):
             else:
                 S1 = DT.TAB_ARCH_COMMON
             S1 = ReplaceMacro(S1, self._Macros)
-            ArchList.add(S1)
 
             # S2 may be Platform or ModuleType
             if len(ItemList) > 2:
-                if self._SectionName.upper() in DT.SECTIONS_HAVE_ITEM_PCD_SET:
+                if self._SectionName in DT.SECTIONS_HAVE_ITEM_PCD_SET:
                     S2 = ItemList[2]
                 else:
                     S2 = ItemList[2].upper()
@@ -360,9 +469,11 @@ class MetaFileParser(object):
                 S3 = ItemList[3]
             else:
                 S3 = DT.TAB_COMMON
-            self._Scope.append([S1, S2, S3])
+            # every record of the section refers to these, so share one copy of each name
+            self._Scope.append([sys.intern(S1), sys.intern(S2), sys.intern(S3)])
 
         # 'COMMON' must not be used with specific ARCHs at the same section
+        ArchList = {Scope[0] for Scope in self._Scope}
         if DT.TAB_ARCH_COMMON in ArchList and len(ArchList) > 1:
             EdkLogger.error('Parser', FORMAT_INVALID, "'common' ARCH must not be used with specific ARCHs",
                             File=self.MetaFile, Line=self._LineIndex + 1, ExtraData=self._CurrentLine)
@@ -388,7 +499,7 @@ class MetaFileParser(object):
             EdkLogger.error('Parser', FORMAT_INVALID, "No value specified",
                             ExtraData=self._CurrentLine, File=self.MetaFile, Line=self._LineIndex + 1)
 
-        self._ValueList = [ReplaceMacro(Value, self._Macros) for Value in self._ValueList]
+        self._ReplaceValueListMacros()
         Name, Value = self._ValueList[1], self._ValueList[2]
         MacroUsed = GlobalData.gMacroRefPattern.findall(Value)
         if len(MacroUsed) != 0:
@@ -399,38 +510,41 @@ class MetaFileParser(object):
                 EdkLogger.error("Parser", FORMAT_INVALID, "%s not defined" % (Macro), ExtraData=self._CurrentLine, File=self.MetaFile, Line=self._LineIndex + 1)
         # Sometimes, we need to make differences between EDK and EDK2 modules
         if Name == 'INF_VERSION':
-            if hexVersionPattern.match(Value):
+            Match = VersionPattern.match(Value)
+            if Match is None:
+                EdkLogger.error('Parser', FORMAT_INVALID, "Invalid version number",
+                                ExtraData=self._CurrentLine, File=self.MetaFile, Line=self._LineIndex + 1)
+            elif Match.lastindex == 1:
                 self._Version = int(Value, 0)
-            elif decVersionPattern.match(Value):
+            else:
                 ValueList = Value.split('.')
                 Major = int(ValueList[0], 0)
                 Minor = int(ValueList[1], 0)
                 if Major > 0xffff or Minor > 0xffff:
                     EdkLogger.error('Parser', FORMAT_INVALID, "Invalid version number",
                                     ExtraData=self._CurrentLine, File=self.MetaFile, Line=self._LineIndex + 1)
-                self._Version = int('0x{0:04x}{1:04x}'.format(Major, Minor), 0)
-            else:
-                EdkLogger.error('Parser', FORMAT_INVALID, "Invalid version number",
-                                ExtraData=self._CurrentLine, File=self.MetaFile, Line=self._LineIndex + 1)
+                self._Version = (Major << 16) | Minor
 
         if isinstance(self, InfParser) and self._Version < 0x00010005:
             # EDK module allows using defines as macros
             self._FileLocalMacros[Name] = Value
+            self._FileLocalMacrosVersion += 1
         self._Defines[Name] = Value
 
     ## [BuildOptions] section parser
     @ParseMacro
     def _BuildOptionParser(self):
         self._CurrentLine = CleanString(self._CurrentLine, BuildOption=True)
-        TokenList = GetSplitValueList(self._CurrentLine, DT.TAB_EQUAL_SPLIT, 1)
-        TokenList2 = GetSplitValueList(TokenList[0], ':', 1)
-        if len(TokenList2) == 2:
-            self._ValueList[0] = TokenList2[0]              # toolchain family
-            self._ValueList[1] = TokenList2[1]              # keys
+        # a key holds no quote or parenthesis, so the first '=' and ':' are the separators
+        Key, Equal, Value = self._CurrentLine.partition(DT.TAB_EQUAL_SPLIT)
+        Family, Colon, Keys = Key.partition(':')
+        if Colon:
+            self._ValueList[0] = Family.strip()             # toolchain family
+            self._ValueList[1] = Keys.strip()               # keys
         else:
-            self._ValueList[1] = TokenList[0]
-        if len(TokenList) == 2 and not isinstance(self, DscParser): # value
-            self._ValueList[2] = ReplaceMacro(TokenList[1], self._Macros)
+            self._ValueList[1] = Key.strip()
+        if Equal and not isinstance(self, DscParser):       # value
+            self._ValueList[2] = ReplaceMacro(Value.strip(), self._Macros)
 
         if self._ValueList[1].count('_') != 4:
             EdkLogger.error(
@@ -444,98 +558,157 @@ class MetaFileParser(object):
     def GetValidExpression(self, TokenSpaceGuid, PcdCName):
         return self._Table.GetValidExpression(TokenSpaceGuid, PcdCName)
 
+    ## Replace the macros used in self._ValueList
+    #
+    #   Most values use no macro at all, so the macro dict is only built when one does.
+    #
+    def _ReplaceValueListMacros(self, RaiseError=False):
+        if any('$(' in Value for Value in self._ValueList):
+            Macros = self._Macros
+            self._ValueList = [ReplaceMacro(Value, Macros, RaiseError=RaiseError) for Value in self._ValueList]
+
+    ## Macros applicable to the current line
+    #
+    #   The merged dict is kept until the file local macros change or other section macros
+    #   apply, so callers must not modify it.
+    #
     @property
     def _Macros(self):
-        Macros = {}
-        Macros.update(self._FileLocalMacros)
-        Macros.update(self._GetApplicableSectionMacro())
+        SectionMacros = self._GetApplicableSectionMacro()
+        Version, CachedSectionMacros, Macros = self._MacrosCache
+        if Version != self._FileLocalMacrosVersion or (CachedSectionMacros is not SectionMacros and (CachedSectionMacros or SectionMacros)):
+            Macros = {**self._FileLocalMacros, **SectionMacros}
+            self._MacrosCache = (self._FileLocalMacrosVersion, SectionMacros, Macros)
         return Macros
 
+    ## Replace the macros in a value, remembering the result for as long as the macros stay the same
+    #
+    #   Paths in the same file tend to repeat the same macro references, e.g. $(ARCH_DIR).
+    #   The memo is only of use where _Macros returns the same dict for unchanged macros.
+    #
+    def _ReplaceMacro(self, Value):
+        if '$(' not in Value:
+            return Value
+        Macros = self._Macros
+        MemoMacros, Memo = self._ReplaceMacroMemo
+        if MemoMacros is not Macros:
+            Memo = {}
+            self._ReplaceMacroMemo = (Macros, Memo)
+        Result = Memo.get(Value)
+        if Result is None:
+            Result = Memo[Value] = ReplaceMacro(Value, Macros)
+        return Result
+
+    ## Hashable form of self._Scope
+    #
+    #   The scope list is replaced on each section header and only ever grows in place,
+    #   so the key is rebuilt only when the list object or its length changes.
+    #
+    @property
+    def _ScopeKey(self):
+        Scope = self._Scope
+        CachedScope, CachedLen, ScopeKey = self._ScopeKeyCache
+        if CachedScope is not Scope or CachedLen != len(Scope):
+            ScopeKey = tuple((Item[0], Item[1], Item[2]) for Item in Scope)
+            self._ScopeKeyCache = (Scope, len(Scope), ScopeKey)
+        return ScopeKey
+
     ## Construct section Macro dict
     def _ConstructSectionMacroDict(self, Name, Value):
-        ScopeKey = [(Scope[0], Scope[1], Scope[2]) for Scope in self._Scope]
-        ScopeKey = tuple(ScopeKey)
+        ScopeKey = self._ScopeKey
         #
         # DecParser SectionType is a list, will contain more than one item only in Pcd Section
         # As Pcd section macro usage is not allowed, so here it is safe
         #
         if isinstance(self, DecParser):
-            SectionDictKey = self._SectionType[0], ScopeKey
+            SectionType = self._SectionType[0]
         else:
-            SectionDictKey = self._SectionType, ScopeKey
+            SectionType = self._SectionType
 
-        self._SectionsMacroDict[SectionDictKey][Name] = Value
+        if ScopeKey not in self._ScopeSets:
+            self._ScopeSets[ScopeKey] = frozenset(ScopeKey)
+        self._SectionsMacroDict[SectionType].setdefault(ScopeKey, {})[Name] = Value
+        self._SectionsMacroVersion += 1
 
     ## Get section Macros that are applicable to current line, which may come from other sections
     ## that share the same name while scope is wider
+    #
+    #   The result only changes with the section macros, the section type and the scope, so
+    #   it is cached on those; callers must not modify the returned dict.
+    #
     def _GetApplicableSectionMacro(self):
-        Macros = {}
-
-        ComComMacroDict = {}
-        ComSpeMacroDict = {}
-        SpeSpeMacroDict = {}
+        if not self._SectionsMacroDict:
+            return {}
 
         ActiveSectionType = self._SectionType
         if isinstance(self, DecParser):
             ActiveSectionType = self._SectionType[0]
 
-        for (SectionType, Scope) in self._SectionsMacroDict:
-            if SectionType != ActiveSectionType:
-                continue
+        # only the sections of the active type apply
+        SectionScopes = self._SectionsMacroDict.get(ActiveSectionType)
+        if not SectionScopes:
+            return {}
 
-            for ActiveScope in self._Scope:
-                Scope0, Scope1, Scope2= ActiveScope[0], ActiveScope[1], ActiveScope[2]
-                if(Scope0, Scope1, Scope2) not in Scope:
-                    break
-            else:
-                SpeSpeMacroDict.update(self._SectionsMacroDict[(SectionType, Scope)])
+        CacheKey = (self._SectionsMacroVersion, ActiveSectionType, self._ScopeKey)
+        if self._SectionMacroCache[0] == CacheKey:
+            return self._SectionMacroCache[1]
 
-            for ActiveScope in self._Scope:
-                Scope0, Scope1, Scope2 = ActiveScope[0], ActiveScope[1], ActiveScope[2]
-                if(Scope0, Scope1, Scope2) not in Scope and (Scope0, DT.TAB_COMMON, DT.TAB_COMMON) not in Scope and (DT.TAB_COMMON, Scope1, DT.TAB_COMMON) not in Scope:
-                    break
-            else:
-                ComSpeMacroDict.update(self._SectionsMacroDict[(SectionType, Scope)])
+        Macros = {}
+
+        ComComMacroDict = {}
+        ComSpeMacroDict = {}
+        SpeSpeMacroDict = {}
 
-            if (DT.TAB_COMMON, DT.TAB_COMMON, DT.TAB_COMMON) in Scope:
-                ComComMacroDict.update(self._SectionsMacroDict[(SectionType, Scope)])
+        # each active scope, with the arch-only and module-type-only scopes that also cover it
+        ActiveScopes = [((Scope0, Scope1, Scope2), (Scope0, DT.TAB_COMMON, DT.TAB_COMMON), (DT.TAB_COMMON, Scope1, DT.TAB_COMMON))
+                        for Scope0, Scope1, Scope2 in self._Scope]
+        ComComScope = (DT.TAB_COMMON, DT.TAB_COMMON, DT.TAB_COMMON)
+        ScopeSets = self._ScopeSets
+        for ScopeKey, SectionMacros in SectionScopes.items():
+            Scope = ScopeSets[ScopeKey]
+            # a section covering every active scope exactly also covers them in the wider sense
+            if all(Spe in Scope for Spe, _, _ in ActiveScopes):
+                SpeSpeMacroDict.update(SectionMacros)
+                ComSpeMacroDict.update(SectionMacros)
+            elif all(Spe in Scope or ComArch in Scope or ComModule in Scope for Spe, ComArch, ComModule in ActiveScopes):
+                ComSpeMacroDict.update(SectionMacros)
+
+            if ComComScope in Scope:
+                ComComMacroDict.update(SectionMacros)
 
         Macros.update(ComComMacroDict)
         Macros.update(ComSpeMacroDict)
         Macros.update(SpeSpeMacroDict)
 
+        self._SectionMacroCache = (CacheKey, Macros)
         return Macros
 
     def ProcessMultipleLineCODEValue(self,Content):
+        # most files have no {CODE(...)} value, and then there is nothing to join
+        if not any("{CODE(" in Line for Line in Content):
+            return Content
         CODEBegin = False
         CODELine = ""
         continuelinecount = 0
         newContent = []
-        for Index in range(0, len(Content)):
-            Line = Content[Index]
+        Append = newContent.append
+        IsComplete = CODEPattern.search
+        for Line in Content:
             if CODEBegin:
                 CODELine = CODELine + Line
                 continuelinecount +=1
                 if ")}" in Line:
-                    newContent.append(CODELine)
-                    for _ in range(continuelinecount):
-                        newContent.append("")
+                    Append(CODELine)
+                    # keep the line count so that line numbers still match the file
+                    newContent.extend([""] * continuelinecount)
                     CODEBegin = False
                     CODELine = ""
                     continuelinecount = 0
+            elif "{CODE(" not in Line or IsComplete(Line) is not None:
+                Append(Line)
             else:
-                if not Line:
-                    newContent.append(Line)
-                    continue
-                if "{CODE(" not in Line:
-                    newContent.append(Line)
-                    continue
-                elif CODEPattern.findall(Line):
-                    newContent.append(Line)
-                    continue
-                else:
-                    CODEBegin = True
-                    CODELine = Line
+                CODEBegin = True
+                CODELine = Line
 
         return newContent
 
@@ -592,7 +765,7 @@ class InfParser(MetaFileParser):
 
     ## Parser starter
     def Start(self):
-        NmakeLine = ''
+        self._NmakeLine = ''
         Content = ''
         try:
             with open(str(self.MetaFile), 'r') as File:
@@ -607,23 +780,30 @@ class InfParser(MetaFileParser):
         SectionComments = []
         Comments = []
 
-        for Index in range(0, len(Content)):
+        # names used for every line, bound once for the loop
+        SectionParser = self._BindSectionParsers()
+        # the table stays the same while the file is read, so its own insert methods are
+        # called, without the _Store and _StoreMany wrappers
+        Store, StoreMany = self._Table.Insert, self._Table.InsertMany
+        # an INF file has no subsections, so everything in it has the owner it was created with
+        Owner = self._Owner[-1]
+        EdkCommentStart, EdkCommentEnd = DT.TAB_COMMENT_EDK_START, DT.TAB_COMMENT_EDK_END
+        SectionStart, SectionEnd = DT.TAB_SECTION_START, DT.TAB_SECTION_END
+        SectionType = self._SectionType
+        for Index, RawLine in enumerate(Content):
             # skip empty, commented, block commented lines
-            Line, Comment = CleanString2(Content[Index], AllowCppStyleComment=True)
-            NextLine = ''
-            if Index + 1 < len(Content):
-                NextLine, NextComment = CleanString2(Content[Index + 1])
-            if Line == '':
+            Line, Comment = CleanString2(RawLine, AllowCppStyleComment=True)
+            if not Line:
                 if Comment:
                     Comments.append((Comment, Index + 1))
                 elif GetHeaderComment:
                     SectionComments.extend(Comments)
                     Comments = []
                 continue
-            if Line.find(DT.TAB_COMMENT_EDK_START) > -1:
+            if EdkCommentStart in Line:
                 IsFindBlockComment = True
                 continue
-            if Line.find(DT.TAB_COMMENT_EDK_END) > -1:
+            if EdkCommentEnd in Line:
                 IsFindBlockComment = False
                 continue
             if IsFindBlockComment:
@@ -633,19 +813,19 @@ class InfParser(MetaFileParser):
             self._CurrentLine = Line
 
             # section header
-            if Line[0] == DT.TAB_SECTION_START and Line[-1] == DT.TAB_SECTION_END:
+            if Line[0] == SectionStart and Line[-1] == SectionEnd:
                 if not GetHeaderComment:
-                    for Cmt, LNo in Comments:
-                        self._Store(DC.MODEL_META_DATA_HEADER_COMMENT, Cmt, '', '', DT.TAB_COMMON,
-                                    DT.TAB_COMMON, self._Owner[-1], LNo, -1, LNo, -1, True)
+                    StoreMany([(DC.MODEL_META_DATA_HEADER_COMMENT, Cmt, '', '', DT.TAB_COMMON,
+                                DT.TAB_COMMON, Owner, LNo, -1, LNo, -1, True) for Cmt, LNo in Comments])
                     GetHeaderComment = True
                 else:
                     TailComments.extend(SectionComments + Comments)
                 Comments = []
                 self._SectionHeaderParser()
+                SectionType = self._SectionType
                 # Check invalid sections
                 if self._Version < 0x00010005:
-                    if self._SectionType in [DC.MODEL_META_DATA_BUILD_OPTION,
+                    if SectionType in [DC.MODEL_META_DATA_BUILD_OPTION,
                                              DC.MODEL_EFI_LIBRARY_CLASS,
                                              DC.MODEL_META_DATA_PACKAGE,
                                              DC.MODEL_PCD_FIXED_AT_BUILD,
@@ -660,7 +840,7 @@ class InfParser(MetaFileParser):
                         EdkLogger.error('Parser', FORMAT_INVALID,
                                         "Section [%s] is not allowed in inf file without version" % (self._SectionName),
                                         ExtraData=self._CurrentLine, File=self.MetaFile, Line=self._LineIndex + 1)
-                elif self._SectionType in [DC.MODEL_EFI_INCLUDE,
+                elif SectionType in [DC.MODEL_EFI_INCLUDE,
                                            DC.MODEL_EFI_LIBRARY_INSTANCE,
                                            DC.MODEL_META_DATA_NMAKE]:
                     EdkLogger.error('Parser', FORMAT_INVALID,
@@ -668,26 +848,16 @@ class InfParser(MetaFileParser):
                                     ExtraData=self._CurrentLine, File=self.MetaFile, Line=self._LineIndex + 1)
                 continue
             # merge two lines specified by '\' in section NMAKE
-            elif self._SectionType == DC.MODEL_META_DATA_NMAKE:
-                if Line[-1] == '\\':
-                    if NextLine == '':
-                        self._CurrentLine = NmakeLine + Line[0:-1]
-                        NmakeLine = ''
-                    else:
-                        if NextLine[0] == DT.TAB_SECTION_START and NextLine[-1] == DT.TAB_SECTION_END:
-                            self._CurrentLine = NmakeLine + Line[0:-1]
-                            NmakeLine = ''
-                        else:
-                            NmakeLine = NmakeLine + ' ' + Line[0:-1]
-                            continue
-                else:
-                    self._CurrentLine = NmakeLine + Line
-                    NmakeLine = ''
+            elif SectionType == DC.MODEL_META_DATA_NMAKE:
+                Line = self._JoinNmakeLine(Line, Content, Index)
+                if Line is None:
+                    continue
+                self._CurrentLine = Line
 
             # section content
             self._ValueList = ['', '', '']
             # parse current line, result will be put in self._ValueList
-            self._SectionParser[self._SectionType](self)
+            SectionParser[SectionType]()
             if self._ValueList is None or self._ItemType == DC.MODEL_META_DATA_DEFINE:
                 self._ItemType = -1
                 Comments = []
@@ -695,28 +865,28 @@ class InfParser(MetaFileParser):
             if Comment:
                 Comments.append((Comment, Index + 1))
             if GlobalData.gOptions and GlobalData.gOptions.CheckUsage:
-                CheckInfComment(self._SectionType, Comments, str(self.MetaFile), Index + 1, self._ValueList)
+                CheckInfComment(SectionType, Comments, str(self.MetaFile), Index + 1, self._ValueList)
             #
             # Model, Value1, Value2, Value3, Arch, Platform, BelongsToItem=-1,
             # LineBegin=-1, ColumnBegin=-1, LineEnd=-1, ColumnEnd=-1, Enabled=True
             #
-            for Arch, Platform, _ in self._Scope:
-                LastItem = self._Store(self._SectionType,
-                            self._ValueList[0],
-                            self._ValueList[1],
-                            self._ValueList[2],
-                            Arch,
-                            Platform,
-                            self._Owner[-1],
-                            self._LineIndex + 1,
-                            - 1,
-                            self._LineIndex + 1,
-                            - 1,
-                            True 
-                            )
-                for Comment, LineNo in Comments:
-                    self._Store(DC.MODEL_META_DATA_COMMENT, Comment, '', '', Arch, Platform,
-                                LastItem, LineNo, -1, LineNo, -1, True)
+            Value1, Value2, Value3 = self._ValueList[0], self._ValueList[1], self._ValueList[2]
+            LineNo = Index + 1
+            if not Comments and len(self._Scope) == 1:
+                # the usual case: a single scope and nothing owned by its record
+                Arch, Platform, _ = self._Scope[0]
+                Store(SectionType, Value1, Value2, Value3, Arch, Platform, Owner, LineNo, - 1, LineNo, - 1, True)
+            elif not Comments:
+                # one record per scope and nothing owned by them
+                StoreMany([(SectionType, Value1, Value2, Value3, Arch, Platform, Owner,
+                                  LineNo, - 1, LineNo, - 1, True) for Arch, Platform, _ in self._Scope])
+            else:
+                # comments follow the record of their scope, which owns them
+                for Arch, Platform, _ in self._Scope:
+                    LastItem = Store(SectionType, Value1, Value2, Value3, Arch, Platform, Owner,
+                                     LineNo, - 1, LineNo, - 1, True)
+                    StoreMany([(DC.MODEL_META_DATA_COMMENT, Comment, '', '', Arch, Platform,
+                                      LastItem, CommentLineNo, -1, CommentLineNo, -1, True) for Comment, CommentLineNo in Comments])
             Comments = []
             SectionComments = []
         TailComments.extend(SectionComments + Comments)
@@ -725,11 +895,29 @@ class InfParser(MetaFileParser):
                             File=self.MetaFile)
 
         # If there are tail comments in INF file, save to database whatever the comments are
-        for Comment in TailComments:
-            self._Store(DC.MODEL_META_DATA_TAIL_COMMENT, Comment[0], '', '', DT.TAB_COMMON,
-                                DT.TAB_COMMON, self._Owner[-1], -1, -1, -1, -1, True)
+        StoreMany([(DC.MODEL_META_DATA_TAIL_COMMENT, Comment[0], '', '', DT.TAB_COMMON,
+                    DT.TAB_COMMON, Owner, -1, -1, -1, -1, True) for Comment in TailComments])
         self._Done()
 
+    ## Join the lines of an [Nmake] statement continued with '\'
+    #
+    #   The '\' ending the last line before a blank line, a section header or the end of
+    #   file is dropped.
+    #
+    #   @retval     The statement ending at Content[Index], or None if it continues on the next line
+    #
+    def _JoinNmakeLine(self, Line, Content, Index):
+        if Line[-1] == '\\':
+            # only a continued line needs a look at the next one
+            NextLine = CleanString2(Content[Index + 1])[0] if Index + 1 < len(Content) else ''
+            if NextLine and not (NextLine[0] == DT.TAB_SECTION_START and NextLine[-1] == DT.TAB_SECTION_END):
+                self._NmakeLine = self._NmakeLine + ' ' + Line[0:-1]
+                return None
+            Line = Line[0:-1]
+        Line = self._NmakeLine + Line
+        self._NmakeLine = ''
+        return Line
+
     ## Data parser for the format in which there's path
     #
     #   Only path can have macro used. So we need to replace them before use.
@@ -737,13 +925,12 @@ class InfParser(MetaFileParser):
     def _IncludeParser(self):
         TokenList = GetSplitValueList(self._CurrentLine, DT.TAB_VALUE_SPLIT)
         self._ValueList[0:len(TokenList)] = TokenList
-        Macros = self._Macros
-        if Macros:
+        if self._Macros:
             for Index in range(0, len(self._ValueList)):
                 Value = self._ValueList[Index]
                 if not Value:
                     continue
-                self._ValueList[Index] = ReplaceMacro(Value, Macros)
+                self._ValueList[Index] = self._ReplaceMacro(Value)
 
     ## Parse [Sources] section
     #
@@ -760,7 +947,7 @@ class InfParser(MetaFileParser):
                 self._ValueList[0] = GetSplitValueList(self._ValueList[0], ' ', 1)[0]
         if self._Defines['BASE_NAME'] == 'Microcode':
             pass
-        self._ValueList = [ReplaceMacro(Value, Macros) for Value in self._ValueList]
+        self._ValueList = [self._ReplaceMacro(Value) for Value in self._ValueList]
 
     ## Parse [Binaries] section
     #
@@ -782,14 +969,14 @@ class InfParser(MetaFileParser):
                             ExtraData=self._CurrentLine + " (<FileType> | <FilePath> [| <Target>])",
                             File=self.MetaFile, Line=self._LineIndex + 1)
         self._ValueList[0:len(TokenList)] = TokenList
-        self._ValueList[1] = ReplaceMacro(self._ValueList[1], self._Macros)
+        self._ValueList[1] = self._ReplaceMacro(self._ValueList[1])
 
     ## [nmake] section parser (Edk.x style only)
     def _NmakeParser(self):
         TokenList = GetSplitValueList(self._CurrentLine, DT.TAB_EQUAL_SPLIT, 1)
         self._ValueList[0:len(TokenList)] = TokenList
         # remove macros
-        self._ValueList[1] = ReplaceMacro(self._ValueList[1], self._Macros)
+        self._ValueList[1] = self._ReplaceMacro(self._ValueList[1])
         # remove self-reference in macro setting
         #self._ValueList[1] = ReplaceMacro(self._ValueList[1], {self._ValueList[0]:''})
 
@@ -812,13 +999,12 @@ class InfParser(MetaFileParser):
 
         # if value are 'True', 'true', 'TRUE' or 'False', 'false', 'FALSE', replace with integer 1 or 0.
         if self._ValueList[2] != '':
-            InfPcdValueList = GetSplitValueList(TokenList[1], DT.TAB_VALUE_SPLIT, 1)
-            if InfPcdValueList[0] in ['True', 'true', 'TRUE']:
-                self._ValueList[2] = TokenList[1].replace(InfPcdValueList[0], '1', 1)
-            elif InfPcdValueList[0] in ['False', 'false', 'FALSE']:
-                self._ValueList[2] = TokenList[1].replace(InfPcdValueList[0], '0', 1)
-            elif isinstance(InfPcdValueList[0], str) and InfPcdValueList[0].find('$(') >= 0:
-                Value = ReplaceExprMacro(InfPcdValueList[0],self._Macros)
+            InfPcdValue = GetSplitValueList(TokenList[1], DT.TAB_VALUE_SPLIT, 1)[0]
+            BoolValue = BoolValueMap.get(InfPcdValue)
+            if BoolValue is not None:
+                self._ValueList[2] = BoolValue + TokenList[1][len(InfPcdValue):]
+            elif '$(' in InfPcdValue:
+                Value = ReplaceExprMacro(InfPcdValue, self._Macros)
                 if Value != '0':
                     self._ValueList[2] = Value
         if (self._ValueList[0], self._ValueList[1]) not in self.PcdsDict:
@@ -899,7 +1085,7 @@ class DscParser(MetaFileParser):
     }
 
     # Valid names in define section
-    DefineKeywords = [
+    DefineKeywords = frozenset([
         "DSC_SPECIFICATION",
         "PLATFORM_NAME",
         "PLATFORM_GUID",
@@ -919,11 +1105,30 @@ class DscParser(MetaFileParser):
         "FIX_LOAD_TOP_MEMORY_ADDRESS",
         "PREBUILD",
         "POSTBUILD"
-    ]
+    ])
 
-    SubSectionDefineKeywords = [
+    SubSectionDefineKeywords = frozenset([
         "FILE_GUID"
-    ]
+    ])
+
+    # Directives opening a conditional block, and directives which need an expression
+    IfDirectives = frozenset(['!IF', '!IFDEF', '!IFNDEF'])
+    ExpressionDirectives = frozenset(['!IF', '!IFDEF', '!INCLUDE', '!IFNDEF', '!ELSEIF'])
+    # Directive records stored under the section scope; the others only under the common one
+    ScopedDirectiveTypes = frozenset([DC.MODEL_META_DATA_INCLUDE, DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_ERROR])
+    CommonScope = ((DT.TAB_COMMON, DT.TAB_COMMON, DT.TAB_COMMON),)
+    # Directive record types opening a conditional block, and those evaluating an expression
+    IfDirectiveTypes = frozenset([DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_IF,
+                                  DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_IFDEF,
+                                  DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_IFNDEF])
+    ExpressionDirectiveTypes = frozenset([DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_IF,
+                                          DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_ELSEIF])
+    # Macro definition record types, in which PCD cannot be referenced
+    DefineTypes = frozenset([DC.MODEL_META_DATA_DEFINE, DC.MODEL_META_DATA_GLOBAL_DEFINE])
+    # PCD record types handled apart from the others when parsed or post-processed
+    HiiPcdTypes = frozenset([DC.MODEL_PCD_DYNAMIC_HII, DC.MODEL_PCD_DYNAMIC_EX_HII])
+    DynamicDefaultPcdTypes = frozenset([DC.MODEL_PCD_DYNAMIC_DEFAULT, DC.MODEL_PCD_DYNAMIC_EX_DEFAULT])
+    FixedPcdTypes = frozenset([DC.MODEL_PCD_FEATURE_FLAG, DC.MODEL_PCD_FIXED_AT_BUILD])
 
     SymbolPattern = ValueExpression.SymbolPattern
 
@@ -949,6 +1154,8 @@ class DscParser(MetaFileParser):
         # to store conditional directive evaluation result
         self._DirectiveStack = []
         self._DirectiveEvalStack = []
+        # the number of False results in _DirectiveEvalStack
+        self._DirectiveFalseCount = 0
         self._Enabled = True
 
         #
@@ -958,6 +1165,11 @@ class DscParser(MetaFileParser):
 
         # Final valid replacable symbols
         self._Symbols = {}
+        # bumped on every change of _Symbols and of the global macros this parser makes,
+        # see _Macros
+        self._MacrosVersion = 0
+        # (macro dict, {expression: result}), see __ProcessDirective
+        self._DirectiveResultMemo = (None, {})
         #
         #  Map the ID between the original table and new table to track
         #  the owner item
@@ -978,13 +1190,26 @@ class DscParser(MetaFileParser):
             EdkLogger.error("Parser", FILE_READ_FAILURE, ExtraData=self.MetaFile)
 
         OwnerId = {}
+        SectionParser = self._BindSectionParsers()
+        # the global defines may have changed since the last parse
+        self._MacrosVersion += 1
 
         Content = self.ProcessMultipleLineCODEValue(Content)
 
-        for Index in range(0, len(Content)):
-            Line,comments = CleanString2(Content[Index])
+        # classify each cleaned line on its first character once; the line kinds
+        # are told apart by that character alone, except for the two bracketed ones
+        SectionStart, SectionEnd = DT.TAB_SECTION_START, DT.TAB_SECTION_END
+        OptionStart, OptionEnd = DT.TAB_OPTION_START, DT.TAB_OPTION_END
+        # objects used on every line which the section parsers never rebind; the raw
+        # table is only replaced after the file is read, in _PostProcess
+        OwnerStack, From = self._Owner, self._From
+        Store, StoreMany = self._Table.Insert, self._Table.InsertMany
+        DirectiveParser = self._DirectiveParser
+        ModelUnknown = DC.MODEL_UNKNOWN
+        for Index, Line in enumerate(Content):
+            Line,comments = CleanString2(Line)
             # skip empty line
-            if Line == '':
+            if not Line:
                 if comments:
                     #print(Index, comments, self.MetaFile.Path)
                     pass
@@ -995,35 +1220,37 @@ class DscParser(MetaFileParser):
 
             self._CurrentLine = Line
             self._LineIndex = Index
-            if self._InSubsection and self._Owner[-1] == -1:
-                self._Owner.append(self._LastItem)
+            if self._InSubsection and OwnerStack[-1] == -1:
+                OwnerStack.append(self._LastItem)
 
+            First = Line[0]
             # section header
-            if Line[0] == DT.TAB_SECTION_START and Line[-1] == DT.TAB_SECTION_END:
+            if First == SectionStart and Line[-1] == SectionEnd:
                 self._SectionType = DC.MODEL_META_DATA_SECTION_HEADER
             # subsection ending
-            elif Line[0] == '}' and self._InSubsection:
+            elif First == '}' and self._InSubsection:
                 self._InSubsection = False
-                self._SubsectionType = DC.MODEL_UNKNOWN
+                self._SubsectionType = ModelUnknown
                 self._SubsectionName = ''
-                self._Owner[-1] = -1
+                OwnerStack[-1] = -1
                 OwnerId.clear()
                 continue
             # subsection header
-            elif Line[0] == DT.TAB_OPTION_START and Line[-1] == DT.TAB_OPTION_END:
+            elif First == OptionStart and Line[-1] == OptionEnd:
                 self._SubsectionType = DC.MODEL_META_DATA_SUBSECTION_HEADER
             # directive line
-            elif Line[0] == '!':
-                TokenList = GetSplitValueList(Line, ' ', 1)
-                if TokenList[0] == DT.TAB_INCLUDE:
+            elif First == '!':
+                # a name equal to !include holds no quote or parenthesis, so a plain split
+                # finds it just as GetSplitValueList would
+                if Line.split(' ', 1)[0] == DT.TAB_INCLUDE:
                     for Arch, ModuleType, DefaultStore in self._Scope:
-                        if self._SubsectionType != DC.MODEL_UNKNOWN and Arch in OwnerId:
-                            self._Owner[-1] = OwnerId[Arch]
-                        self._DirectiveParser()
+                        if self._SubsectionType != ModelUnknown and Arch in OwnerId:
+                            OwnerStack[-1] = OwnerId[Arch]
+                        DirectiveParser()
                 else:
-                    self._DirectiveParser()
+                    DirectiveParser()
                 continue
-            if Line[0] == DT.TAB_OPTION_START and not self._InSubsection:
+            if First == OptionStart and not self._InSubsection:
                 EdkLogger.error("Parser", FILE_READ_FAILURE, "Missing the '{' before %s in Line %s" % (Line, Index+1), ExtraData=self.MetaFile)
 
             if self._InSubsection:
@@ -1034,42 +1261,46 @@ class DscParser(MetaFileParser):
 
             self._ValueList = ['', '', '']
             # "SET pcd = pcd_expression" syntax is not supported in Dsc file.
-            if self._CurrentLine.upper().strip().startswith("SET "):
+            # The cleaned line carries no surrounding blanks, so only its head matters.
+            if Line[:4].upper() == "SET ":
                 EdkLogger.error('Parser', FORMAT_INVALID, '''"SET pcd = pcd_expression" syntax is not support in Dsc file''',
                                 ExtraData=self._CurrentLine,
                                 File=self.MetaFile, Line=self._LineIndex + 1)
-            self._SectionParser[SectionType](self)
+            SectionParser[SectionType]()
             if self._ValueList is None:
                 continue
             #
             # Model, Value1, Value2, Value3, Arch, ModuleType, BelongsToItem=-1, BelongsToFile=-1,
             # LineBegin=-1, ColumnBegin=-1, LineEnd=-1, ColumnEnd=-1, Enabled=-1
             #
-            for Arch, ModuleType, DefaultStore in self._Scope:
-                Owner = self._Owner[-1]
-                if self._SubsectionType != DC.MODEL_UNKNOWN and Arch in OwnerId:
-                    Owner = OwnerId[Arch]
-                self._LastItem = self._Store(
-                                        self._ItemType,
-                                        self._ValueList[0],
-                                        self._ValueList[1],
-                                        self._ValueList[2],
-                                        Arch,
-                                        ModuleType,
-                                        DefaultStore,
-                                        Owner,
-                                        self._From,
-                                        self._LineIndex + 1,
-                                        - 1,
-                                        self._LineIndex + 1,
-                                        - 1,
-                                        "",
-                                        "",
-                                        "",
-                                        self._Enabled
-                                        )
-                if self._SubsectionType == DC.MODEL_UNKNOWN and self._InSubsection:
+            # one record per scope, stored together; a record of a subsection line is
+            # owned by the component of its arch, which an earlier line stored
+            ItemType, Value1, Value2, Value3 = self._ItemType, self._ValueList[0], self._ValueList[1], self._ValueList[2]
+            InSubsectionItem = self._SubsectionType != ModelUnknown
+            LineOwner, Enabled = OwnerStack[-1], self._Enabled
+            Scope = self._Scope
+            # most sections have a single scope, which needs no row list
+            if len(Scope) == 1:
+                Arch, ModuleType, DefaultStore = Scope[0]
+                Owner = OwnerId.get(Arch, LineOwner) if InSubsectionItem else LineOwner
+                self._LastItem = Store(ItemType, Value1, Value2, Value3, Arch, ModuleType, DefaultStore, Owner, From,
+                                       Index + 1, - 1, Index + 1, - 1, "", "", "", Enabled)
+                if not InSubsectionItem and self._InSubsection:
                     OwnerId[Arch] = self._LastItem
+                continue
+            Rows = []
+            for Arch, ModuleType, DefaultStore in Scope:
+                Owner = LineOwner
+                if InSubsectionItem and Arch in OwnerId:
+                    Owner = OwnerId[Arch]
+                Rows.append((ItemType, Value1, Value2, Value3, Arch, ModuleType, DefaultStore, Owner, From,
+                             Index + 1, - 1, Index + 1, - 1, "", "", "", Enabled))
+            ItemIds = StoreMany(Rows)
+            if ItemIds:
+                self._LastItem = ItemIds[-1]
+            if not InSubsectionItem and self._InSubsection:
+                for (Arch, _, _), ItemId in zip(Scope, ItemIds):
+                    OwnerId[Arch] = ItemId
 
         if self._DirectiveStack:
             _, Line, Text = self._DirectiveStack[-1]
@@ -1100,37 +1331,34 @@ class DscParser(MetaFileParser):
             EdkLogger.error("Parser", FORMAT_INVALID, "Unknown directive [%s]" % DirectiveName,
                             File=self.MetaFile, Line=self._LineIndex + 1)
 
-        if DirectiveName in ['!IF', '!IFDEF', '!IFNDEF']:
+        if DirectiveName in self.IfDirectives:
             self._InDirective += 1
 
-        if DirectiveName in ['!ENDIF']:
+        if DirectiveName == '!ENDIF':
             self._InDirective -= 1
 
-        if DirectiveName in ['!IF', '!IFDEF', '!INCLUDE', '!IFNDEF', '!ELSEIF'] and self._ValueList[1] == '':
+        if DirectiveName in self.ExpressionDirectives and self._ValueList[1] == '':
             EdkLogger.error("Parser", FORMAT_INVALID, "Missing expression",
                             File=self.MetaFile, Line=self._LineIndex + 1,
                             ExtraData=self._CurrentLine)
 
         ItemType = self.DataType[DirectiveName]
-        Scope = [[DT.TAB_COMMON, DT.TAB_COMMON, DT.TAB_COMMON]]
-        if ItemType == DC.MODEL_META_DATA_INCLUDE:
-            Scope = self._Scope
-        elif ItemType == DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_ERROR:
+        if ItemType in self.ScopedDirectiveTypes:
             Scope = self._Scope
+        else:
+            Scope = self.CommonScope
         if ItemType == DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_ENDIF:
             # Remove all directives between !if and !endif, including themselves
             while self._DirectiveStack:
                 # Remove any !else or !elseif
                 DirectiveInfo = self._DirectiveStack.pop()
-                if DirectiveInfo[0] in [DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_IF,
-                                        DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_IFDEF,
-                                        DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_IFNDEF]:
+                if DirectiveInfo[0] in self.IfDirectiveTypes:
                     break
             else:
                 EdkLogger.error("Parser", FORMAT_INVALID, "Redundant '!endif'",
                                 File=self.MetaFile, Line=self._LineIndex + 1,
                                 ExtraData=self._CurrentLine)
-        elif ItemType not in {DC.MODEL_META_DATA_INCLUDE, DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_ERROR}:
+        elif ItemType not in self.ScopedDirectiveTypes:
             # Break if there's a !else is followed by a !elseif
             if ItemType == DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_ELSEIF and \
                self._DirectiveStack and \
@@ -1144,26 +1372,19 @@ class DscParser(MetaFileParser):
         # Model, Value1, Value2, Value3, Arch, ModuleType, BelongsToItem=-1, BelongsToFile=-1,
         # LineBegin=-1, ColumnBegin=-1, LineEnd=-1, ColumnEnd=-1, Enabled=-1
         #
-        for Arch, ModuleType, DefaultStore in Scope:
-            self._LastItem = self._Store(
-                                    ItemType,
-                                    self._ValueList[0],
-                                    self._ValueList[1],
-                                    self._ValueList[2],
-                                    Arch,
-                                    ModuleType,
-                                    DefaultStore,
-                                    self._Owner[-1],
-                                    self._From,
-                                    self._LineIndex + 1,
-                                    - 1,
-                                    self._LineIndex + 1,
-                                    - 1,
-                                    "",
-                                    "",
-                                    "",
-                                    True 
-                                    )
+        Owner, LineNo = self._Owner[-1], self._LineIndex + 1
+        if len(Scope) == 1:
+            Arch, ModuleType, DefaultStore = Scope[0]
+            self._LastItem = self._Store(ItemType, self._ValueList[0], self._ValueList[1], self._ValueList[2],
+                                         Arch, ModuleType, DefaultStore, Owner, self._From,
+                                         LineNo, - 1, LineNo, - 1, "", "", "", True)
+            return
+        ItemIds = self._StoreMany([(ItemType, self._ValueList[0], self._ValueList[1], self._ValueList[2],
+                                    Arch, ModuleType, DefaultStore, Owner, self._From,
+                                    LineNo, - 1, LineNo, - 1, "", "", "", True)
+                                   for Arch, ModuleType, DefaultStore in Scope])
+        if ItemIds:
+            self._LastItem = ItemIds[-1]
 
     ## [defines] section parser
     @ParseMacro
@@ -1187,7 +1408,7 @@ class DscParser(MetaFileParser):
                             ExtraData=self._CurrentLine, File=self.MetaFile, Line=self._LineIndex + 1)
         if not self._InSubsection:
             self._Defines[self._ValueList[1]] = self._ValueList[2]
-        self._ItemType = self.DataType[DT.TAB_DSC_DEFINES.upper()]
+        self._ItemType = self.DataType[DscDefinesSection]
 
     @ParseMacro
     def _SkuIdParser(self):
@@ -1239,9 +1460,10 @@ class DscParser(MetaFileParser):
                 return
         TokenList = GetSplitValueList(self._CurrentLine, DT.TAB_VALUE_SPLIT, 1)
         self._CurrentPcdName = TokenList[0]
-        if len(TokenList) == 2 and TokenList[1].strip().startswith("{CODE"):
+        # GetSplitValueList strips the fields already
+        if len(TokenList) == 2 and TokenList[1].startswith("{CODE"):
             self._PcdDataTypeCODE = True
-            self._PcdCodeValue = TokenList[1].strip()
+            self._PcdCodeValue = TokenList[1]
 
         if self._PcdDataTypeCODE:
             if self._CurrentLine.endswith(")}"):
@@ -1250,14 +1472,16 @@ class DscParser(MetaFileParser):
             else:
                 self._ValueList = None
                 return
-        self._ValueList[0:1] = GetSplitValueList(TokenList[0], DT.TAB_SPLIT)
         PcdNameTockens = GetSplitValueList(TokenList[0], DT.TAB_SPLIT)
+        self._ValueList[0:1] = PcdNameTockens
         if len(PcdNameTockens) == 2:
             self._ValueList[0], self._ValueList[1] = PcdNameTockens[0], PcdNameTockens[1]
         elif len(PcdNameTockens) == 3:
             self._ValueList[0], self._ValueList[1] = ".".join((PcdNameTockens[0], PcdNameTockens[1])), PcdNameTockens[2]
         elif len(PcdNameTockens) > 3:
             self._ValueList[0], self._ValueList[1] = ".".join((PcdNameTockens[0], PcdNameTockens[1])), ".".join(PcdNameTockens[2:])
+        # most PCD rows share a few token space GUID names, so keep one copy of each
+        self._ValueList[0] = sys.intern(self._ValueList[0])
         if len(TokenList) == 2:
             self._ValueList[2] = TokenList[1]
         if self._ValueList[0] == '' or self._ValueList[1] == '':
@@ -1276,24 +1500,23 @@ class DscParser(MetaFileParser):
 
         # Validate the datum type of Dynamic Defaul PCD and DynamicEx Default PCD
         ValueList = GetSplitValueList(self._ValueList[2])
-        if len(ValueList) > 1 and ValueList[1] in [DT.TAB_UINT8, DT.TAB_UINT16, DT.TAB_UINT32, DT.TAB_UINT64] \
-                              and self._ItemType in [DC.MODEL_PCD_DYNAMIC_DEFAULT, DC.MODEL_PCD_DYNAMIC_EX_DEFAULT]:
+        if len(ValueList) > 1 and ValueList[1] in UnsignedDatumTypes \
+                              and self._ItemType in self.DynamicDefaultPcdTypes:
             EdkLogger.error('Parser', FORMAT_INVALID, "The datum type '%s' of PCD is wrong" % ValueList[1],
                             ExtraData=self._CurrentLine, File=self.MetaFile, Line=self._LineIndex + 1)
 
         # Validate the VariableName of DynamicHii and DynamicExHii for PCD Entry must not be an empty string
-        if self._ItemType in [DC.MODEL_PCD_DYNAMIC_HII, DC.MODEL_PCD_DYNAMIC_EX_HII]:
-            DscPcdValueList = GetSplitValueList(TokenList[1], DT.TAB_VALUE_SPLIT, 1)
-            if len(DscPcdValueList[0].replace('L', '').replace('"', '').strip()) == 0:
+        # (the value is TokenList[1], so the split above already gives its leading field)
+        if self._ItemType in self.HiiPcdTypes:
+            if len(ValueList[0].replace('L', '').replace('"', '').strip()) == 0:
                 EdkLogger.error('Parser', FORMAT_INVALID, "The VariableName field in the HII format PCD entry must not be an empty string",
                             ExtraData=self._CurrentLine, File=self.MetaFile, Line=self._LineIndex + 1)
 
         # if value are 'True', 'true', 'TRUE' or 'False', 'false', 'FALSE', replace with integer 1 or 0.
-        DscPcdValueList = GetSplitValueList(TokenList[1], DT.TAB_VALUE_SPLIT, 1)
-        if DscPcdValueList[0] in ['True', 'true', 'TRUE']:
-            self._ValueList[2] = TokenList[1].replace(DscPcdValueList[0], '1', 1);
-        elif DscPcdValueList[0] in ['False', 'false', 'FALSE']:
-            self._ValueList[2] = TokenList[1].replace(DscPcdValueList[0], '0', 1);
+        # (the split items are stripped, so the first one is a prefix of the value)
+        BoolValue = BoolValueMap.get(ValueList[0])
+        if BoolValue is not None:
+            self._ValueList[2] = BoolValue + TokenList[1][len(ValueList[0]):]
 
 
     ## [components] section parser
@@ -1323,22 +1546,26 @@ class DscParser(MetaFileParser):
                             ExtraData=self._CurrentLine + " (<LibraryClassName>|<LibraryInstancePath>)",
                             File=self.MetaFile, Line=self._LineIndex + 1)
 
-        self._ValueList[0:len(TokenList)] = TokenList
+        if len(TokenList) == 2:
+            self._ValueList[0], self._ValueList[1] = TokenList
+        else:
+            self._ValueList[0:len(TokenList)] = TokenList
 
 
     ## [BuildOptions] section parser
     @ParseMacro
     def _BuildOptionParser(self):
         self._CurrentLine = CleanString(self._CurrentLine, BuildOption=True)
-        TokenList = GetSplitValueList(self._CurrentLine, DT.TAB_EQUAL_SPLIT, 1)
-        TokenList2 = GetSplitValueList(TokenList[0], ':', 1)
-        if len(TokenList2) == 2:
-            self._ValueList[0] = TokenList2[0]  # toolchain family
-            self._ValueList[1] = TokenList2[1]  # keys
+        # a key holds no quote or parenthesis, so the first '=' and ':' are the separators
+        Key, Equal, Value = self._CurrentLine.partition(DT.TAB_EQUAL_SPLIT)
+        Family, Colon, Keys = Key.partition(':')
+        if Colon:
+            self._ValueList[0] = Family.strip() # toolchain family
+            self._ValueList[1] = Keys.strip()   # keys
         else:
-            self._ValueList[1] = TokenList[0]
-        if len(TokenList) == 2:                 # value
-            self._ValueList[2] = TokenList[1]
+            self._ValueList[1] = Key.strip()
+        if Equal:                               # value
+            self._ValueList[2] = Value.strip()
 
         if self._ValueList[1].count('_') != 4:
             EdkLogger.error(
@@ -1351,16 +1578,25 @@ class DscParser(MetaFileParser):
                 )
 
     ## Override parent's method since we'll do all macro replacements in parser
+    #
+    #   The merged dict is kept until the file local macros, the PCD symbols or the global
+    #   macros change, or other section macros apply, so callers must not modify it. The
+    #   global defines given from outside are taken as fixed while a file is parsed and
+    #   post-processed; Start() and _PostProcess() drop the kept dict.
+    #
     @property
     def _Macros(self):
-        Macros = {}
-        Macros.update(self._FileLocalMacros)
-        Macros.update(self._GetApplicableSectionMacro())
-        Macros.update(GlobalData.gEdkGlobal)
-        Macros.update(GlobalData.gPlatformDefines)
-        Macros.update(GlobalData.gCommandLineDefines)
+        SectionMacros = self._GetApplicableSectionMacro()
         # PCD cannot be referenced in macro definition
-        if self._ItemType not in [DC.MODEL_META_DATA_DEFINE, DC.MODEL_META_DATA_GLOBAL_DEFINE]:
+        WithSymbols = self._ItemType not in self.DefineTypes
+        Key = (self._FileLocalMacrosVersion, self._MacrosVersion, WithSymbols)
+        CachedKey, CachedSectionMacros, Macros = self._MacrosCache
+        if CachedKey == Key and (CachedSectionMacros is SectionMacros or not (CachedSectionMacros or SectionMacros)):
+            return Macros
+
+        Macros = {**self._FileLocalMacros, **SectionMacros, **GlobalData.gEdkGlobal,
+                  **GlobalData.gPlatformDefines, **GlobalData.gCommandLineDefines}
+        if WithSymbols:
             Macros.update(self._Symbols)
         if GlobalData.BuildOptionPcd:
             for Item in GlobalData.BuildOptionPcd:
@@ -1369,73 +1605,45 @@ class DscParser(MetaFileParser):
                 PcdName, TmpValue = Item.split("=")
                 TmpValue = BuildOptionValue(TmpValue, self._GuidDict)
                 Macros[PcdName.strip()] = TmpValue
+        self._MacrosCache = (Key, SectionMacros, Macros)
         return Macros
 
     def _PostProcess(self):
-        Processer = {
-            DC.MODEL_META_DATA_SECTION_HEADER                  :   self.__ProcessSectionHeader,
-            DC.MODEL_META_DATA_SUBSECTION_HEADER               :   self.__ProcessSubsectionHeader,
-            DC.MODEL_META_DATA_HEADER                          :   self.__ProcessDefine,
-            DC.MODEL_META_DATA_DEFINE                          :   self.__ProcessDefine,
-            DC.MODEL_META_DATA_GLOBAL_DEFINE                   :   self.__ProcessDefine,
-            DC.MODEL_META_DATA_INCLUDE                         :   self.__ProcessDirective,
-            DC.MODEL_META_DATA_PACKAGE                         :   self.__ProcessPackages,
-            DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_IF        :   self.__ProcessDirective,
-            DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_ELSE      :   self.__ProcessDirective,
-            DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_IFDEF     :   self.__ProcessDirective,
-            DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_IFNDEF    :   self.__ProcessDirective,
-            DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_ENDIF     :   self.__ProcessDirective,
-            DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_ELSEIF    :   self.__ProcessDirective,
-            DC.MODEL_EFI_SKU_ID                                :   self.__ProcessSkuId,
-            DC.MODEL_EFI_DEFAULT_STORES                        :   self.__ProcessDefaultStores,
-            DC.MODEL_EFI_LIBRARY_INSTANCE                      :   self.__ProcessLibraryInstance,
-            DC.MODEL_EFI_LIBRARY_CLASS                         :   self.__ProcessLibraryClass,
-            DC.MODEL_PCD_FIXED_AT_BUILD                        :   self.__ProcessPcd,
-            DC.MODEL_PCD_PATCHABLE_IN_MODULE                   :   self.__ProcessPcd,
-            DC.MODEL_PCD_FEATURE_FLAG                          :   self.__ProcessPcd,
-            DC.MODEL_PCD_DYNAMIC_DEFAULT                       :   self.__ProcessPcd,
-            DC.MODEL_PCD_DYNAMIC_HII                           :   self.__ProcessPcd,
-            DC.MODEL_PCD_DYNAMIC_VPD                           :   self.__ProcessPcd,
-            DC.MODEL_PCD_DYNAMIC_EX_DEFAULT                    :   self.__ProcessPcd,
-            DC.MODEL_PCD_DYNAMIC_EX_HII                        :   self.__ProcessPcd,
-            DC.MODEL_PCD_DYNAMIC_EX_VPD                        :   self.__ProcessPcd,
-            DC.MODEL_META_DATA_COMPONENT                       :   self.__ProcessComponent,
-            DC.MODEL_META_DATA_BUILD_OPTION                    :   self.__ProcessBuildOption,
-            DC.MODEL_UNKNOWN                                   :   self._Skip,
-            DC.MODEL_META_DATA_USER_EXTENSION                  :   self._SkipUserExtension,
-            DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_ERROR     :   self._ProcessError,
-        }
+        Processer = self._PostProcesser
 
         self._Table = MetaFileStorage(self.MetaFile, DC.MODEL_FILE_DSC, True)
         self._DirectiveStack = []
         self._DirectiveEvalStack = []
+        self._DirectiveFalseCount = 0
         self._FileWithError = self.MetaFile
         self._FileLocalMacros = {}
+        self._FileLocalMacrosVersion += 1
         self._SectionsMacroDict.clear()
+        self._SectionsMacroVersion += 1
         GlobalData.gPlatformDefines = {}
+        self._MacrosVersion += 1
 
         # Get all macro and PCD which has straitforward value
         self.__RetrievePcdValue()
         self._Content = self._RawTable.GetAll()
         self._ContentIndex = 0
+        # the records of the files whose !include is being processed, each with the index
+        # to go on from once the included records are done
+        self._ContentStack = []
         self._InSubsection = False
-        while self._ContentIndex < len(self._Content) :
+        # the loop below runs once per record, so the objects it uses on every pass are
+        # bound once here; neither is replaced while the records are processed
+        Store = self._Table.Insert
+        IdMapping = self._IdMapping
+        while self._ContentIndex < len(self._Content) or self._ContentStack:
+            if self._ContentIndex >= len(self._Content):
+                self._Content, self._ContentIndex = self._ContentStack.pop()
+                continue
             # Id, self._ItemType, V1, V2, V3, S1, S2, S3, Owner, self._From, \
                 # LineStart, ColStart, LineEnd, ColEnd, Enabled = self._Content[self._ContentIndex]
 
-            item = self._Content[self._ContentIndex]
-            Id = item.ID
-            self._ItemType = item.Model
-            V1 = item.Value1
-            V2 = item.Value2
-            V3 = item.Value3
-            S1 = item.Scope1
-            S2 = item.Scope2
-            S3 = item.Scope3
-            Owner = item.BelongsToItem
-            self._From = item.FromItem
-            LineStart = item.StartLine
-            LineEnd = item.EndLine
+            Id, self._ItemType, V1, V2, V3, S1, S2, S3, Owner, self._From, \
+                LineStart, LineEnd = DscRecordFields(self._Content[self._ContentIndex])
 
             if self._From < 0:
                 self._FileWithError = self.MetaFile
@@ -1461,12 +1669,9 @@ class DscParser(MetaFileParser):
             self._LineIndex = LineStart - 1
             self._ValueList = [V1, V2, V3]
 
-            if Owner > 0 and Owner in self._IdMapping:
-                self._InSubsection = True
-            else:
-                self._InSubsection = False
+            self._InSubsection = Owner > 0 and Owner in IdMapping
             try:
-                Processer[self._ItemType]()
+                Processer[self._ItemType](self)
             except EvaluationException as Excpt:
                 #
                 # Only catch expression evaluation error here. We need to report
@@ -1497,9 +1702,9 @@ class DscParser(MetaFileParser):
             if self._ValueList is None:
                 continue
 
-            NewOwner = self._IdMapping.get(Owner, -1)
-            self._Enabled = (not self._DirectiveEvalStack) or (False not in self._DirectiveEvalStack)
-            self._LastItem = self._Store(
+            NewOwner = IdMapping.get(Owner, -1)
+            self._Enabled = not self._DirectiveFalseCount
+            self._LastItem = Store(
                                 self._ItemType,
                                 self._ValueList[0],
                                 self._ValueList[1],
@@ -1518,11 +1723,13 @@ class DscParser(MetaFileParser):
                                 "",
                                 self._Enabled
                                 )
-            self._IdMapping[Id] = self._LastItem
+            IdMapping[Id] = self._LastItem
 
         GlobalData.gPlatformDefines.update(self._FileLocalMacros)
+        self._MacrosVersion += 1
         self._PostProcessed = True
         self._Content = None
+        self._ContentStack = None
     def _ProcessError(self):
         if not self._Enabled:
             return
@@ -1549,6 +1756,9 @@ class DscParser(MetaFileParser):
         except:
             EdkLogger.error("Parser", FILE_READ_FAILURE, ExtraData=self.MetaFile)
 
+        # index of every section header line, and the cleaned header of those already used
+        SectionLines = [Index for Index, Line in enumerate(Content) if Line.lstrip().startswith(DT.TAB_SECTION_START)]
+        SectionHeaders = {}
         GlobalData.gPlatformOtherPcds['DSCFILE'] = str(self.MetaFile)
         for PcdType in (DC.MODEL_PCD_PATCHABLE_IN_MODULE, DC.MODEL_PCD_DYNAMIC_DEFAULT, DC.MODEL_PCD_DYNAMIC_HII,
                         DC.MODEL_PCD_DYNAMIC_VPD, DC.MODEL_PCD_DYNAMIC_EX_DEFAULT, DC.MODEL_PCD_DYNAMIC_EX_HII,
@@ -1561,17 +1771,19 @@ class DscParser(MetaFileParser):
                 Line = item.StartLine
                 Name = TokenSpaceGuid + '.' + PcdName
                 if Name not in GlobalData.gPlatformOtherPcds:
-                    PcdLine = Line
-                    while not Content[Line - 1].lstrip().startswith(DT.TAB_SECTION_START):
-                        Line -= 1
-                    GlobalData.gPlatformOtherPcds[Name] = (CleanString(Content[Line - 1]), PcdLine, PcdType)
+                    # the last section header at or above the PCD line
+                    Header = SectionLines[bisect.bisect_right(SectionLines, Line - 1) - 1]
+                    if Header not in SectionHeaders:
+                        SectionHeaders[Header] = CleanString(Content[Header])
+                    GlobalData.gPlatformOtherPcds[Name] = (SectionHeaders[Header], Line, PcdType)
 
     def __ProcessDefine(self):
         if not self._Enabled:
             return
 
         Type, Name, Value = self._ValueList
-        Value = ReplaceMacro(Value, self._Macros, False)
+        if '$(' in Value:
+            Value = ReplaceMacro(Value, self._Macros, False)
         #
         # If it is <Defines>, return
         #
@@ -1582,43 +1794,52 @@ class DscParser(MetaFileParser):
         if self._ItemType == DC.MODEL_META_DATA_DEFINE:
             if self._SectionType == DC.MODEL_META_DATA_HEADER:
                 self._FileLocalMacros[Name] = Value
+                self._FileLocalMacrosVersion += 1
             else:
                 self._ConstructSectionMacroDict(Name, Value)
         elif self._ItemType == DC.MODEL_META_DATA_GLOBAL_DEFINE:
             GlobalData.gEdkGlobal[Name] = Value
+            self._MacrosVersion += 1
 
         #
         # Keyword in [Defines] section can be used as Macros
         #
         if (self._ItemType == DC.MODEL_META_DATA_HEADER) and (self._SectionType == DC.MODEL_META_DATA_HEADER):
             self._FileLocalMacros[Name] = Value
+            self._FileLocalMacrosVersion += 1
 
         self._ValueList = [Type, Name, Value]
 
     def __ProcessDirective(self):
         Result = None
-        if self._ItemType in [DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_IF,
-                             DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_ELSEIF]:
+        if self._ItemType in self.ExpressionDirectiveTypes:
+            # The same conditions come up again and again with unchanged macros and PCDs,
+            # and the kept macro dict is replaced on any change of them, so the results
+            # are kept with it. Expressions failing or warning are evaluated each time.
             Macros = self._Macros
-            Macros.update(GlobalData.gGlobalDefines)
-            try:
-                Result = ValueExpression(self._ValueList[1], Macros)()
-            except SymbolNotFound as Exc:
-                EdkLogger.debug(EdkLogger.DEBUG_5, str(Exc), self._ValueList[1])
-                Result = False
-            except WrnExpression as Excpt:
-                #
-                # Catch expression evaluation warning here. We need to report
-                # the precise number of line and return the evaluation result
-                #
-                EdkLogger.warn('Parser', "Suspicious expression: %s" % str(Excpt),
-                                File=self._FileWithError, ExtraData=' '.join(self._ValueList),
-                                Line=self._LineIndex + 1)
-                Result = Excpt.result
+            MemoMacros, Memo = self._DirectiveResultMemo
+            if MemoMacros is not Macros:
+                Memo = {}
+                self._DirectiveResultMemo = (Macros, Memo)
+            Result = Memo.get(self._ValueList[1])
+            if Result is None:
+                try:
+                    Result = ValueExpression(self._ValueList[1], {**Macros, **GlobalData.gGlobalDefines})()
+                    Memo[self._ValueList[1]] = Result
+                except SymbolNotFound as Exc:
+                    EdkLogger.debug(EdkLogger.DEBUG_5, str(Exc), self._ValueList[1])
+                    Result = False
+                except WrnExpression as Excpt:
+                    #
+                    # Catch expression evaluation warning here. We need to report
+                    # the precise number of line and return the evaluation result
+                    #
+                    EdkLogger.warn('Parser', "Suspicious expression: %s" % str(Excpt),
+                                    File=self._FileWithError, ExtraData=' '.join(self._ValueList),
+                                    Line=self._LineIndex + 1)
+                    Result = Excpt.result
 
-        if self._ItemType in [DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_IF,
-                              DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_IFDEF,
-                              DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_IFNDEF]:
+        if self._ItemType in self.IfDirectiveTypes:
             self._DirectiveStack.append(self._ItemType)
             if self._ItemType == DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_IF:
                 Result = bool(Result)
@@ -1629,22 +1850,30 @@ class DscParser(MetaFileParser):
                 if self._ItemType == DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_IFNDEF:
                     Result = not Result
             self._DirectiveEvalStack.append(Result)
+            if not Result:
+                self._DirectiveFalseCount += 1
         elif self._ItemType == DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_ELSEIF:
             self._DirectiveStack.append(self._ItemType)
-            self._DirectiveEvalStack[-1] = not self._DirectiveEvalStack[-1]
-            self._DirectiveEvalStack.append(bool(Result))
+            Previous = not self._DirectiveEvalStack[-1]
+            self._DirectiveEvalStack[-1] = Previous
+            self._DirectiveFalseCount += -1 if Previous else 1
+            Result = bool(Result)
+            self._DirectiveEvalStack.append(Result)
+            if not Result:
+                self._DirectiveFalseCount += 1
         elif self._ItemType == DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_ELSE:
             self._DirectiveStack.append(self._ItemType)
-            self._DirectiveEvalStack[-1] = not self._DirectiveEvalStack[-1]
+            Previous = not self._DirectiveEvalStack[-1]
+            self._DirectiveEvalStack[-1] = Previous
+            self._DirectiveFalseCount += -1 if Previous else 1
             self._DirectiveEvalStack.append(True)
         elif self._ItemType == DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_ENDIF:
             # Back to the nearest !if/!ifdef/!ifndef
             while self._DirectiveStack:
-                self._DirectiveEvalStack.pop()
+                if not self._DirectiveEvalStack.pop():
+                    self._DirectiveFalseCount -= 1
                 Directive = self._DirectiveStack.pop()
-                if Directive in [DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_IF,
-                                 DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_IFDEF,
-                                 DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_IFNDEF]:
+                if Directive in self.IfDirectiveTypes:
                     break
         elif self._ItemType == DC.MODEL_META_DATA_INCLUDE:
             # The included file must be relative to workspace or same directory as DSC file
@@ -1698,33 +1927,35 @@ class DscParser(MetaFileParser):
                 Parser._Enabled = self._Enabled
                 # Parse the included file
                 Parser.StartParse()
-                # Insert all records in the table for the included file into dsc file table
+                # Process all records in the table for the included file in place of the
+                # !include, then go on with the records after it
                 Records = IncludedFileTable.GetAll()
                 if Records:
-                    self._Content[self._ContentIndex:self._ContentIndex] = Records
-                    self._Content.pop(self._ContentIndex - 1)
+                    self._ContentStack.append((self._Content, self._ContentIndex))
+                    self._Content = Records
+                    self._ContentIndex = 0
                     self._ValueList = None
-                    self._ContentIndex -= 1
 
     def __ProcessPackages(self):
-        self._ValueList[0] = ReplaceMacro(self._ValueList[0], self._Macros)
+        if '$(' in self._ValueList[0]:
+            self._ValueList[0] = ReplaceMacro(self._ValueList[0], self._Macros)
 
     def __ProcessSkuId(self):
-        self._ValueList = [ReplaceMacro(Value, self._Macros, RaiseError=True)
-                           for Value in self._ValueList]
+        self._ReplaceValueListMacros(RaiseError=True)
     def __ProcessDefaultStores(self):
-        self._ValueList = [ReplaceMacro(Value, self._Macros, RaiseError=True)
-                           for Value in self._ValueList]
+        self._ReplaceValueListMacros(RaiseError=True)
 
     def __ProcessLibraryInstance(self):
-        self._ValueList = [ReplaceMacro(Value, self._Macros) for Value in self._ValueList]
+        self._ReplaceValueListMacros()
 
     def __ProcessLibraryClass(self):
-        self._ValueList[1] = ReplaceMacro(self._ValueList[1], self._Macros, RaiseError=True)
+        if '$(' in self._ValueList[1]:
+            self._ValueList[1] = ReplaceMacro(self._ValueList[1], self._Macros, RaiseError=True)
 
     def __ProcessPcd(self):
-        if self._ItemType not in [DC.MODEL_PCD_FEATURE_FLAG, DC.MODEL_PCD_FIXED_AT_BUILD]:
-            self._ValueList[2] = ReplaceMacro(self._ValueList[2], self._Macros, RaiseError=True)
+        if self._ItemType not in self.FixedPcdTypes:
+            if '$(' in self._ValueList[2]:
+                self._ValueList[2] = ReplaceMacro(self._ValueList[2], self._Macros, RaiseError=True)
             return
 
         ValList, Valid, Index = AnalyzeDscPcd(self._ValueList[2], self._ItemType)
@@ -1749,20 +1980,21 @@ class DscParser(MetaFileParser):
         if ValList[Index] == 'False':
             ValList[Index] = '0'
 
-        if (not self._DirectiveEvalStack) or (False not in self._DirectiveEvalStack):
+        if not self._DirectiveFalseCount:
             GlobalData.gPlatformPcds[DT.TAB_SPLIT.join(self._ValueList[0:2])] = PcdValue
             self._Symbols[DT.TAB_SPLIT.join(self._ValueList[0:2])] = PcdValue
+            self._MacrosVersion += 1
         try:
             self._ValueList[2] = '|'.join(ValList)
         except Exception:
             print(ValList)
 
     def __ProcessComponent(self):
-        self._ValueList[0] = ReplaceMacro(self._ValueList[0], self._Macros)
+        if '$(' in self._ValueList[0]:
+            self._ValueList[0] = ReplaceMacro(self._ValueList[0], self._Macros)
 
     def __ProcessBuildOption(self):
-        self._ValueList = [ReplaceMacro(Value, self._Macros, RaiseError=False)
-                           for Value in self._ValueList]
+        self._ReplaceValueListMacros()
 
     def DisableOverrideComponent(self,module_id):
         for ori_id in self._IdMapping:
@@ -1793,6 +2025,41 @@ class DscParser(MetaFileParser):
         DC.MODEL_META_DATA_SUBSECTION_HEADER               :   _SubsectionHeaderParser,
     }
 
+    # handlers of _PostProcess, by record model
+    _PostProcesser = {
+        DC.MODEL_META_DATA_SECTION_HEADER                  :   __ProcessSectionHeader,
+        DC.MODEL_META_DATA_SUBSECTION_HEADER               :   __ProcessSubsectionHeader,
+        DC.MODEL_META_DATA_HEADER                          :   __ProcessDefine,
+        DC.MODEL_META_DATA_DEFINE                          :   __ProcessDefine,
+        DC.MODEL_META_DATA_GLOBAL_DEFINE                   :   __ProcessDefine,
+        DC.MODEL_META_DATA_INCLUDE                         :   __ProcessDirective,
+        DC.MODEL_META_DATA_PACKAGE                         :   __ProcessPackages,
+        DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_IF        :   __ProcessDirective,
+        DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_ELSE      :   __ProcessDirective,
+        DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_IFDEF     :   __ProcessDirective,
+        DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_IFNDEF    :   __ProcessDirective,
+        DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_ENDIF     :   __ProcessDirective,
+        DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_ELSEIF    :   __ProcessDirective,
+        DC.MODEL_EFI_SKU_ID                                :   __ProcessSkuId,
+        DC.MODEL_EFI_DEFAULT_STORES                        :   __ProcessDefaultStores,
+        DC.MODEL_EFI_LIBRARY_INSTANCE                      :   __ProcessLibraryInstance,
+        DC.MODEL_EFI_LIBRARY_CLASS                         :   __ProcessLibraryClass,
+        DC.MODEL_PCD_FIXED_AT_BUILD                        :   __ProcessPcd,
+        DC.MODEL_PCD_PATCHABLE_IN_MODULE                   :   __ProcessPcd,
+        DC.MODEL_PCD_FEATURE_FLAG                          :   __ProcessPcd,
+        DC.MODEL_PCD_DYNAMIC_DEFAULT                       :   __ProcessPcd,
+        DC.MODEL_PCD_DYNAMIC_HII                           :   __ProcessPcd,
+        DC.MODEL_PCD_DYNAMIC_VPD                           :   __ProcessPcd,
+        DC.MODEL_PCD_DYNAMIC_EX_DEFAULT                    :   __ProcessPcd,
+        DC.MODEL_PCD_DYNAMIC_EX_HII                        :   __ProcessPcd,
+        DC.MODEL_PCD_DYNAMIC_EX_VPD                        :   __ProcessPcd,
+        DC.MODEL_META_DATA_COMPONENT                       :   __ProcessComponent,
+        DC.MODEL_META_DATA_BUILD_OPTION                    :   __ProcessBuildOption,
+        DC.MODEL_UNKNOWN                                   :   MetaFileParser._Skip,
+        DC.MODEL_META_DATA_USER_EXTENSION                  :   MetaFileParser._SkipUserExtension,
+        DC.MODEL_META_DATA_CONDITIONAL_STATEMENT_ERROR     :   _ProcessError,
+    }
+
 ## DEC file parser class
 #
 #   @param      FilePath        The path of platform description file
@@ -1834,7 +2101,7 @@ class DecParser(MetaFileParser):
         MetaFileParser.__init__(self, FilePath, FileType, Arch, Table, -1)
         self._Comments = []
         self._Version = 0x00010005  # Only EDK2 dec file is supported
-        self._AllPCDs = [] # Only for check duplicate PCD
+        self._AllPCDs = set() # Only for check duplicate PCD
         self._AllPcdDict = {}
 
         self._CurrentStructurePcdName = ""
@@ -1855,8 +2122,10 @@ class DecParser(MetaFileParser):
         Content = self.ProcessMultipleLineCODEValue(Content)
 
         self._DefinesCount = 0
-        for Index in range(0, len(Content)):
-            Line, Comment = CleanString2(Content[Index])
+        SectionParser = self._BindSectionParsers()
+        Store, StoreMany = self._Table.Insert, self._Table.InsertMany
+        for Index, Line in enumerate(Content):
+            Line, Comment = CleanString2(Line)
             self._CurrentLine = Line
             self._LineIndex = Index
 
@@ -1870,7 +2139,7 @@ class DecParser(MetaFileParser):
             # section header
             if Line[0] == DT.TAB_SECTION_START and Line[-1] == DT.TAB_SECTION_END:
                 self._SectionHeaderParser()
-                if self._SectionName == DT.TAB_DEC_DEFINES.upper():
+                if self._SectionName == DecDefinesSection:
                     self._DefinesCount += 1
                 self._Comments = []
                 continue
@@ -1885,7 +2154,7 @@ class DecParser(MetaFileParser):
 
             # section content
             self._ValueList = ['', '', '']
-            self._SectionParser[self._SectionType[0]](self)
+            SectionParser[self._SectionType[0]]()
             if self._ValueList is None or self._ItemType == DC.MODEL_META_DATA_DEFINE:
                 self._ItemType = -1
                 self._Comments = []
@@ -1895,36 +2164,28 @@ class DecParser(MetaFileParser):
             # Model, Value1, Value2, Value3, Arch, BelongsToItem=-1, LineBegin=-1,
             # ColumnBegin=-1, LineEnd=-1, ColumnEnd=-1, FeatureFlag='', Enabled=-1
             #
-            for Arch, ModuleType, Type in self._Scope:
-                self._LastItem = self._Store(
-                    Type,
-                    self._ValueList[0],
-                    self._ValueList[1],
-                    self._ValueList[2],
-                    Arch,
-                    ModuleType,
-                    self._Owner[-1],
-                    self._LineIndex + 1,
-                    - 1,
-                    self._LineIndex + 1,
-                    - 1,
-                    True
-                    )
-                for Comment, LineNo in self._Comments:
-                    self._Store(
-                        DC.MODEL_META_DATA_COMMENT,
-                        Comment,
-                        self._ValueList[0],
-                        self._ValueList[1],
-                        Arch,
-                        ModuleType,
-                        self._LastItem,
-                        LineNo,
-                        - 1,
-                        LineNo,
-                        - 1,
-                        True
-                        )
+            Value1, Value2, Value3 = self._ValueList[0], self._ValueList[1], self._ValueList[2]
+            Owner = self._Owner[-1]
+            LineNo = Index + 1
+            if not self._Comments and len(self._Scope) == 1:
+                # the usual case: a single scope and nothing owned by its record
+                Arch, ModuleType, Type = self._Scope[0]
+                self._LastItem = Store(Type, Value1, Value2, Value3, Arch, ModuleType, Owner,
+                                       LineNo, - 1, LineNo, - 1, True)
+            elif not self._Comments:
+                # one record per scope and nothing owned by them
+                ItemIds = StoreMany([(Type, Value1, Value2, Value3, Arch, ModuleType, Owner,
+                                      LineNo, - 1, LineNo, - 1, True) for Arch, ModuleType, Type in self._Scope])
+                if ItemIds:
+                    self._LastItem = ItemIds[-1]
+            else:
+                # comments follow the record of their scope, which owns them
+                for Arch, ModuleType, Type in self._Scope:
+                    self._LastItem = Store(Type, Value1, Value2, Value3, Arch, ModuleType, Owner,
+                                           LineNo, - 1, LineNo, - 1, True)
+                    StoreMany([(DC.MODEL_META_DATA_COMMENT, Comment, Value1, Value2, Arch, ModuleType,
+                                self._LastItem, CommentLineNo, - 1, CommentLineNo, - 1, True)
+                               for Comment, CommentLineNo in self._Comments])
             self._Comments = []
         if self._DefinesCount > 1:
             EdkLogger.error('Parser', FORMAT_INVALID, 'Multiple [Defines] section is exist.', self.MetaFile )
@@ -1945,8 +2206,10 @@ class DecParser(MetaFileParser):
         self._SectionType = []
         ArchList = set()
         PrivateList = set()
-        Line = re.sub(',[\s]*', DT.TAB_COMMA_SPLIT, self._CurrentLine)
-        for Item in Line[1:-1].split(DT.TAB_COMMA_SPLIT):
+        # the spaces after each comma are not part of the next item
+        Parts = self._CurrentLine[1:-1].split(DT.TAB_COMMA_SPLIT)
+        Items = Parts[:1] + [Part.lstrip() for Part in Parts[1:]]
+        for Item in Items:
             if Item == '':
                 EdkLogger.error("Parser", FORMAT_UNKNOWN_ERROR,
                                 "section name can NOT be empty or incorrectly use separator comma",
@@ -1955,12 +2218,13 @@ class DecParser(MetaFileParser):
 
             # different types of PCD are permissible in one section
             self._SectionName = ItemList[0].upper()
-            if self._SectionName == DT.TAB_DEC_DEFINES.upper() and (len(ItemList) > 1 or len(Line.split(DT.TAB_COMMA_SPLIT)) > 1):
+            if self._SectionName == DecDefinesSection and (len(ItemList) > 1 or len(Items) > 1):
                 EdkLogger.error("Parser", FORMAT_INVALID, "Defines section format is invalid",
                                 self.MetaFile, self._LineIndex + 1, self._CurrentLine)
-            if self._SectionName in self.DataType:
-                if self.DataType[self._SectionName] not in self._SectionType:
-                    self._SectionType.append(self.DataType[self._SectionName])
+            SectionType = self.DataType.get(self._SectionName)
+            if SectionType is not None:
+                if SectionType not in self._SectionType:
+                    self._SectionType.append(SectionType)
             else:
                 EdkLogger.error("Parser", FORMAT_UNKNOWN_ERROR, "%s is not a valid section name" % Item,
                                 self.MetaFile, self._LineIndex + 1, self._CurrentLine)
@@ -1984,15 +2248,15 @@ class DecParser(MetaFileParser):
             if len(ItemList) > 2:
                 S2 = ItemList[2].upper()
                 # only Includes, GUIDs, PPIs, Protocols section have Private tag
-                if self._SectionName in [DT.TAB_INCLUDES.upper(), DT.TAB_GUIDS.upper(), DT.TAB_PROTOCOLS.upper(), DT.TAB_PPIS.upper()]:
+                if self._SectionName in PrivateSections:
                     if S2 != 'PRIVATE':
                         EdkLogger.error("Parser", FORMAT_INVALID, 'Please use keyword "Private" as section tag modifier.',
                                         File=self.MetaFile, Line=self._LineIndex + 1, ExtraData=self._CurrentLine)
             else:
                 S2 = DT.TAB_COMMON
             PrivateList.add(S2)
-            if [S1, S2, self.DataType[self._SectionName]] not in self._Scope:
-                self._Scope.append([S1, S2, self.DataType[self._SectionName]])
+            if [S1, S2, SectionType] not in self._Scope:
+                self._Scope.append([sys.intern(S1), sys.intern(S2), SectionType])
 
         # 'COMMON' must not be used with specific ARCHs at the same section
         if DT.TAB_ARCH_COMMON in ArchList and len(ArchList) > 1:
@@ -2031,9 +2295,9 @@ class DecParser(MetaFileParser):
             self._GuidDict[self._ValueList[0]] = self._ValueList[1]
 
     def ParsePcdName(self,namelist):
-        if "[" in namelist[1]:
-            pcdname = namelist[1][:namelist[1].index("[")]
-            arrayindex = namelist[1][namelist[1].index("["):]
+        pcdname, bracket, arrayindex = namelist[1].partition("[")
+        if bracket:
+            arrayindex = bracket + arrayindex
             namelist[1] = pcdname
             if len(namelist) == 2:
                 namelist.append(arrayindex)
@@ -2054,32 +2318,33 @@ class DecParser(MetaFileParser):
 
         if self._CurrentStructurePcdName:
             self._ValueList[0] = self._CurrentStructurePcdName
+            Line = self._CurrentLine
 
-            if "|" not in self._CurrentLine:
-                if "<HeaderFiles>" == self._CurrentLine:
+            if "|" not in Line:
+                if Line == "<HeaderFiles>":
                     self._include_flag = True
                     self._package_flag = False
                     self._ValueList = None
                     return
-                if "<Packages>" == self._CurrentLine:
+                if Line == "<Packages>":
                     self._package_flag = True
                     self._ValueList = None
                     self._include_flag = False
                     return
 
-                if self._include_flag:
-                    self._ValueList[1] = "<HeaderFiles>_" + md5(self._CurrentLine.encode('utf-8')).hexdigest()
-                    self._ValueList[2] = self._CurrentLine
-                if self._package_flag and "}" != self._CurrentLine:
-                    self._ValueList[1] = "<Packages>_" + md5(self._CurrentLine.encode('utf-8')).hexdigest()
-                    self._ValueList[2] = self._CurrentLine
-                if self._CurrentLine == "}":
+                if Line == "}":
                     self._package_flag = False
                     self._include_flag = False
                     self._ValueList = None
                     return
+                if self._include_flag:
+                    self._ValueList[1] = StructurePcdItemName("<HeaderFiles>", Line)
+                    self._ValueList[2] = Line
+                if self._package_flag:
+                    self._ValueList[1] = StructurePcdItemName("<Packages>", Line)
+                    self._ValueList[2] = Line
             else:
-                PcdTockens = self._CurrentLine.split(DT.TAB_VALUE_SPLIT)
+                PcdTockens = Line.split(DT.TAB_VALUE_SPLIT, 2)
                 PcdNames = self.ParsePcdName(PcdTockens[0].split(DT.TAB_SPLIT))
                 if len(PcdNames) == 2:
                     if PcdNames[1].strip().endswith("]"):
@@ -2108,20 +2373,21 @@ class DecParser(MetaFileParser):
                     self._PcdCodeValue = self._PcdCodeValue + "\n " + self._CurrentLine
                     self._ValueList = None
                     return
-            TokenList = GetSplitValueList(self._CurrentLine, DT.TAB_VALUE_SPLIT, 1)
+            # the PCD name holds no quote or parenthesis, so the first '|' ends it
+            PcdName, Sep, PcdValue = self._CurrentLine.partition(DT.TAB_VALUE_SPLIT)
+            TokenList = [PcdName.strip(), PcdValue.strip()] if Sep else [PcdName.strip()]
             self._CurrentPcdName = TokenList[0]
-            if len(TokenList) == 2 and TokenList[1].strip().startswith("{CODE"):
+            if len(TokenList) == 2 and TokenList[1].startswith("{CODE"):
                 if ")}" in self._CurrentLine:
                     self._PcdDataTypeCODE = False
                     self._PcdCodeValue = ""
                 else:
                     self._PcdDataTypeCODE = True
-                    self._PcdCodeValue = TokenList[1].strip()
+                    self._PcdCodeValue = TokenList[1]
                     self._ValueList = None
                     return
 
             self._ValueList[0:1] = GetSplitValueList(TokenList[0], DT.TAB_SPLIT)
-            ValueRe = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*')
             # check PCD information
             if self._ValueList[0] == '' or self._ValueList[1] == '':
                 EdkLogger.error('Parser', FORMAT_INVALID, "No token space GUID or PCD name specified",
@@ -2129,13 +2395,13 @@ class DecParser(MetaFileParser):
                                           " (<TokenSpaceGuidCName>.<PcdCName>|<DefaultValue>|<DatumType>|<Token>)",
                                 File=self.MetaFile, Line=self._LineIndex + 1)
             # check format of token space GUID CName
-            if not ValueRe.match(self._ValueList[0]):
+            if not CNamePattern.match(self._ValueList[0]):
                 EdkLogger.error('Parser', FORMAT_INVALID, "The format of the token space GUID CName is invalid. The correct format is '(a-zA-Z_)[a-zA-Z0-9_]*'",
                                 ExtraData=self._CurrentLine + \
                                           " (<TokenSpaceGuidCName>.<PcdCName>|<DefaultValue>|<DatumType>|<Token>)",
                                 File=self.MetaFile, Line=self._LineIndex + 1)
             # check format of PCD CName
-            if not ValueRe.match(self._ValueList[1]):
+            if not CNamePattern.match(self._ValueList[1]):
                 EdkLogger.error('Parser', FORMAT_INVALID, "The format of the PCD CName is invalid. The correct format is '(a-zA-Z_)[a-zA-Z0-9_]*'",
                                 ExtraData=self._CurrentLine + \
                                           " (<TokenSpaceGuidCName>.<PcdCName>|<DefaultValue>|<DatumType>|<Token>)",
@@ -2148,12 +2414,11 @@ class DecParser(MetaFileParser):
                                 File=self.MetaFile, Line=self._LineIndex + 1)
 
 
-            ValueRe = re.compile(r'^\s*L?\".*\|.*\"')
-            PtrValue = ValueRe.findall(TokenList[1])
+            PtrValue = PtrStringPattern.findall(TokenList[1])
 
             # Has VOID* type string, may contain "|" character in the string.
             if len(PtrValue) != 0:
-                ptrValueList = re.sub(ValueRe, '', TokenList[1])
+                ptrValueList = PtrStringPattern.sub('', TokenList[1])
                 ValueList = AnalyzePcdExpression(ptrValueList)
                 ValueList[0] = PtrValue[0]
             else:
@@ -2188,8 +2453,10 @@ class DecParser(MetaFileParser):
             PcdValue = ValueList[0]
             if PcdValue:
                 try:
-                    self._GuidDict.update(self._AllPcdDict)
-                    ValueList[0] = ValueExpressionEx(ValueList[0], ValueList[1], self._GuidDict)(True)
+                    if PlainPcdValuePattern.match(PcdValue):
+                        ValueList[0] = EvaluatePlainPcdValue(PcdValue, ValueList[1])
+                    else:
+                        ValueList[0] = ValueExpressionEx(ValueList[0], ValueList[1], self._GuidDict)(True)
                 except BadExpression as Value:
                     EdkLogger.error('Parser', FORMAT_INVALID, Value, ExtraData=self._CurrentLine, File=self.MetaFile, Line=self._LineIndex + 1)
             # check format of default value against the datum type
@@ -2203,19 +2470,20 @@ class DecParser(MetaFileParser):
                 self._ValueList[0] = self._CurrentStructurePcdName
                 self._ValueList[1] = ValueList[1].strip()
 
-            if ValueList[0] in ['True', 'true', 'TRUE']:
-                ValueList[0] = '1'
-            elif ValueList[0] in ['False', 'false', 'FALSE']:
-                ValueList[0] = '0'
+            if ValueList[0] in BoolValueMap:
+                ValueList[0] = BoolValueMap[ValueList[0]]
 
             # check for duplicate PCD definition
-            if (self._Scope[0], self._ValueList[0], self._ValueList[1]) in self._AllPCDs:
+            PcdKey = (tuple(self._Scope[0]), self._ValueList[0], self._ValueList[1])
+            if PcdKey in self._AllPCDs:
                 EdkLogger.error('Parser', FORMAT_INVALID,
                                 "The same PCD name and GUID have been already defined",
                                 ExtraData=self._CurrentLine, File=self.MetaFile, Line=self._LineIndex + 1)
             else:
-                self._AllPCDs.append((self._Scope[0], self._ValueList[0], self._ValueList[1]))
-                self._AllPcdDict[DT.TAB_SPLIT.join(self._ValueList[0:2])] = ValueList[0]
+                self._AllPCDs.add(PcdKey)
+                # the PCDs are symbols for the values of the PCDs after them
+                Name = DT.TAB_SPLIT.join(self._ValueList[0:2])
+                self._AllPcdDict[Name] = self._GuidDict[Name] = ValueList[0]
 
             self._ValueList[2] = ValueList[0].strip() + '|' + ValueList[1].strip() + '|' + ValueList[2].strip()
 
@@ -15,15 +15,56 @@ from CommonDataClass.DataClass import MODEL_FILE_DSC, MODEL_FILE_DEC, MODEL_FILE
                                       MODEL_FILE_OTHERS
 import Common.DataType as DT
 from dataclasses import dataclass, field
+from collections import defaultdict
+from sys import intern
+from functools import lru_cache
+import re
+
+## Regular expression for the @ValidRange/@ValidList/@Expression PCD comments
+ValidCommentPattern = re.compile(r'@(ValidRange|ValidList|Expression)')
+
+## Get the arch (Scope1) values a query for the given arch accepts
+#
+#   @param      Arch    The arch queried, other than COMMON
+#
+@lru_cache(maxsize=128)
+def ArchScopeSet(Arch):
+    return frozenset(('COMMON', Arch))
+
+## Get the platform (Scope2) values a query for the given platform accepts
+#
+#   @param      Platform    The platform queried, other than COMMON
+#
+@lru_cache(maxsize=128)
+def PlatformScopeSet(Platform):
+    return frozenset(('COMMON', 'DEFAULT', Platform))
+
+## Get the module type (Scope2) values a DSC query for the given one accepts
+#
+#   A scope like "IA32.DXE_DRIVER" also accepts "COMMON.DXE_DRIVER".
+#
+#   @param      Scope2  The module type queried, other than COMMON
+#
+@lru_cache(maxsize=128)
+def DscScope2Set(Scope2):
+    if '.' in Scope2:
+        Index = Scope2.index('.')
+        return frozenset(('COMMON', 'DEFAULT', Scope2, DT.TAB_COMMON + Scope2[Index:]))
+    return frozenset(('COMMON', 'DEFAULT', Scope2))
 
 class MetaFileTable():
     # TRICK: use file ID as the part before '.'
     _ID_STEP_ = 1
-    _ID_MAX_ = 99999999
+    # max number of Query() results kept, the oldest is dropped first
+    _QUERY_CACHE_SIZE_ = 1024
 
     ## Constructor
     def __init__(self):
         self.CurrentContent = []
+        # records of each Model, in insertion order
+        self._ModelIndex = defaultdict(list)
+        # Query() results by argument, emptied whenever the records change
+        self._QueryCache = {}
         self.ID = 0
 
     def IsIntegrity(self):
@@ -40,15 +81,58 @@ class MetaFileTable():
             return False
         return True
 
+    ## Add a record built by Insert() to the table and to the indexes of the table
+    #
+    def _AddRecord(self, row):
+        self.CurrentContent.append(row)
+        self._ModelIndex[row.Model].append(row)
+        if self._QueryCache:
+            self._QueryCache.clear()
+
     def SetEndFlag(self):
         self.CurrentContent.append(self._DUMMY_)
 
+    ## Insert several records, each given as the argument tuple of Insert()
+    #
+    # @retval:       The IDs of the inserted records
+    #
+    def InsertMany(self, Rows):
+        Insert = self.Insert
+        return [Insert(*Row) for Row in Rows]
+
     def GetAll(self):
         return [item for item in self.CurrentContent if item.ID >= 0 and item.Enabled]
 
+    ## Query several models through the per-model record index
+    #
+    # @param    Models:     The Models of Record
+    # @param    Args:       The other Query() arguments, applied to each model
+    #
+    # @retval:       A dict of the recordSet found for each model
+    #
+    def QueryMany(self, Models, *Args):
+        return dict((Model, self.Query(Model, *Args)) for Model in Models)
+
+    ## Query table, reusing the result of an earlier identical query
+    #
+    # The arguments are those of the _Query() of the table.
+    #
+    # @retval:       A recordSet of all found records
+    #
+    def Query(self, *Args, **Kwargs):
+        Key = (Args, tuple(sorted(Kwargs.items())))
+        QueryCache = self._QueryCache
+        if Key not in QueryCache:
+            if len(QueryCache) >= self._QUERY_CACHE_SIZE_:
+                del QueryCache[next(iter(QueryCache))]
+            QueryCache[Key] = self._Query(*Args, **Kwargs)
+        return list(QueryCache[Key])
+
 
 @dataclass
 class InfLine:
+    __slots__ = ("ID", "Model", "Value1", "Value2", "Value3", "Scope1", "Scope2", "BelongsToItem",
+                 "StartLine", "StartColumn", "EndLine", "EndColumn", "Enabled")
     ID: int
     Model: int
     Value1: str
@@ -91,10 +175,8 @@ class ModuleTable(MetaFileTable):
     def Insert(self, Model, Value1, Value2, Value3, Scope1=DT.TAB_ARCH_COMMON, Scope2=DT.TAB_COMMON,
                BelongsToItem=-1, StartLine=-1, StartColumn=-1, EndLine=False, EndColumn=-1, Enabled=True):
 
-        (Value1, Value2, Value3, Scope1, Scope2) = (Value1.strip(), Value2.strip(), Value3.strip(), Scope1.strip(), Scope2.strip())
+        (Value1, Value2, Value3, Scope1, Scope2) = (Value1.strip(), Value2.strip(), Value3.strip(), intern(Scope1.strip()), intern(Scope2.strip()))
         self.ID = self.ID + self._ID_STEP_
-        if self.ID >= (MODEL_FILE_INF + self._ID_MAX_):
-            self.ID = MODEL_FILE_INF + self._ID_STEP_
 
         row = InfLine( self.ID,
                 Model,
@@ -110,9 +192,29 @@ class ModuleTable(MetaFileTable):
                 EndColumn,
                 Enabled
         )
-        self.CurrentContent.append(row)
+        self._AddRecord(row)
         return self.ID
 
+    ## Insert several records into table Inf
+    #
+    # Each row is the full argument tuple of Insert(), from Model to Enabled.
+    #
+    # @retval:       The IDs of the inserted records
+    #
+    def InsertMany(self, Rows):
+        AddRecord = self._AddRecord
+        IdList = []
+        ID = self.ID
+        for (Model, Value1, Value2, Value3, Scope1, Scope2, BelongsToItem,
+             StartLine, StartColumn, EndLine, EndColumn, Enabled) in Rows:
+            ID = ID + self._ID_STEP_
+            row = InfLine(ID, Model, Value1.strip(), Value2.strip(), Value3.strip(), intern(Scope1.strip()),
+                          intern(Scope2.strip()), BelongsToItem, StartLine, StartColumn, EndLine, EndColumn, Enabled)
+            AddRecord(row)
+            IdList.append(ID)
+        self.ID = ID
+        return IdList
+
     ## Query table
     #
     # @param    Model:      The Model of Record
@@ -121,28 +223,24 @@ class ModuleTable(MetaFileTable):
     #
     # @retval:       A recordSet of all found records
     #
-    def Query(self, Model, Arch=None, Platform=None, BelongsToItem=None):
-
-        QueryTab = self.CurrentContent
-        result = [item for item in QueryTab if item.Model == Model and item.Enabled ]
+    def _Query(self, Model, Arch=None, Platform=None, BelongsToItem=None):
 
+        ArchList = None
         if Arch is not None and Arch != DT.TAB_ARCH_COMMON:
-            ArchList = set(['COMMON'])
-            ArchList.add(Arch)
-            result = [item for item in result if item.Scope1 in ArchList]
-
+            ArchList = ArchScopeSet(Arch)
+        Platformlist = None
         if Platform is not None and Platform != DT.TAB_COMMON:
-            Platformlist = set( ['COMMON','DEFAULT'])
-            Platformlist.add(Platform)
-            result = [item for item in result if item.Scope2 in Platformlist]
+            Platformlist = PlatformScopeSet(Platform)
 
-        if BelongsToItem is not None:
-            result = [item for item in result if item.BelongsToItem == BelongsToItem]
-
-        return result
+        return [item for item in self._ModelIndex.get(Model, ()) if item.Enabled
+                and (ArchList is None or item.Scope1 in ArchList)
+                and (Platformlist is None or item.Scope2 in Platformlist)
+                and (BelongsToItem is None or item.BelongsToItem == BelongsToItem)]
 
 @dataclass
 class DecLine:
+    __slots__ = ("ID", "Model", "Value1", "Value2", "Value3", "Scope1", "Scope2", "BelongsToItem",
+                 "StartLine", "StartColumn", "EndLine", "EndColumn", "Enabled")
     ID: int
     Model: int
     Value1: str
@@ -185,7 +283,7 @@ class PackageTable(MetaFileTable):
     #
     def Insert(self, Model, Value1, Value2, Value3, Scope1=DT.TAB_ARCH_COMMON, Scope2=DT.TAB_COMMON,
                BelongsToItem=-1, StartLine=-1, StartColumn=-1, EndLine=False, EndColumn=-1, Enabled=True):
-        (Value1, Value2, Value3, Scope1, Scope2) = (Value1.strip(), Value2.strip(), Value3.strip(), Scope1.strip(), Scope2.strip())
+        (Value1, Value2, Value3, Scope1, Scope2) = (Value1.strip(), Value2.strip(), Value3.strip(), intern(Scope1.strip()), intern(Scope2.strip()))
         self.ID = self.ID + self._ID_STEP_
 
         row = DecLine(
@@ -203,7 +301,7 @@ class PackageTable(MetaFileTable):
                 EndColumn,
                 Enabled
         )
-        self.CurrentContent.append(row)
+        self._AddRecord(row)
         return self.ID
 
     ## Query table
@@ -213,17 +311,13 @@ class PackageTable(MetaFileTable):
     #
     # @retval:       A recordSet of all found records
     #
-    def Query(self, Model, Arch=None):
-
-        QueryTab = self.CurrentContent
-        result = [item for item in QueryTab if item.Model == Model and item.Enabled>=0 ]
+    def _Query(self, Model, Arch=None):
 
+        Records = self._ModelIndex.get(Model, ())
         if Arch is not None and Arch != DT.TAB_ARCH_COMMON:
-            ArchList = set(['COMMON'])
-            ArchList.add(Arch)
-            result = [item for item in result if item.Scope1 in ArchList]
-
-        return result
+            ArchList = ArchScopeSet(Arch)
+            return [item for item in Records if item.Enabled and item.Scope1 in ArchList]
+        return [item for item in Records if item.Enabled]
 
     def GetValidExpression(self, TokenSpaceGuid, PcdCName):
 
@@ -232,38 +326,25 @@ class PackageTable(MetaFileTable):
         validateranges = []
         validlists = []
         expressions = []
-        try:
-            for row in result:
-                comment = row[0]
-
-                LineNum = row[1]
-                comment = comment.strip("#")
-                comment = comment.strip()
-                oricomment = comment
-                if comment.startswith("@ValidRange"):
-                    comment = comment.replace("@ValidRange", "", 1)
-                    validateranges.append(comment.split("|")[1].strip())
-                if comment.startswith("@ValidList"):
-                    comment = comment.replace("@ValidList", "", 1)
-                    validlists.append(comment.split("|")[1].strip())
-                if comment.startswith("@Expression"):
-                    comment = comment.replace("@Expression", "", 1)
-                    expressions.append(comment.split("|")[1].strip())
-        except Exception as Exc:
-            ValidType = ""
-            if oricomment.startswith("@ValidRange"):
-                ValidType = "@ValidRange"
-            if oricomment.startswith("@ValidList"):
-                ValidType = "@ValidList"
-            if oricomment.startswith("@Expression"):
-                ValidType = "@Expression"
-            EdkLogger.error('Parser', FORMAT_INVALID, "The syntax for %s of PCD %s.%s is incorrect" % (ValidType, TokenSpaceGuid, PcdCName),
-                            ExtraData=oricomment, File=self.MetaFile, Line=LineNum)
-            return set(), set(), set()
+        ValidTypeLists = {"ValidRange": validateranges, "ValidList": validlists, "Expression": expressions}
+        for row in result:
+            comment = row[0].strip("#").strip()
+            Match = ValidCommentPattern.match(comment)
+            if Match is None:
+                continue
+            try:
+                ValidTypeLists[Match.group(1)].append(comment[Match.end():].split("|")[1].strip())
+            except IndexError:
+                EdkLogger.error('Parser', FORMAT_INVALID, "The syntax for %s of PCD %s.%s is incorrect" % (Match.group(0), TokenSpaceGuid, PcdCName),
+                                ExtraData=comment, File=self.MetaFile, Line=row[1])
+                return set(), set(), set()
         return set(validateranges), set(validlists), set(expressions)
 
 @dataclass
 class DscLine:
+    __slots__ = ("ID", "Model", "Value1", "Value2", "Value3", "Scope1", "Scope2", "Scope3", "BelongsToItem",
+                 "FromItem", "StartLine", "StartColumn", "EndLine", "EndColumn", "Comment", "Condition",
+                 "Included", "Enabled")
     ID: int
     Model: int
     Value1: str
@@ -291,6 +372,9 @@ class PlatformTable(MetaFileTable):
     ## Constructor
     def __init__(self):
         MetaFileTable.__init__(self)
+        # records by ID, and the records belonging to each item
+        self._RowIndex = {}
+        self._ChildIndex = defaultdict(list)
 
     ## Insert table
     #
@@ -312,7 +396,7 @@ class PlatformTable(MetaFileTable):
     #
     def Insert(self, Model, Value1, Value2, Value3, Scope1=DT.TAB_ARCH_COMMON, Scope2=DT.TAB_COMMON, Scope3=DT.TAB_DEFAULT_STORES_DEFAULT,BelongsToItem=-1,
                FromItem=-1, StartLine=-1, StartColumn=-1, EndLine=-1, EndColumn=-1, Comment="",Condition="",Included="",Enabled=True):
-        (Value1, Value2, Value3, Scope1, Scope2, Scope3) = (Value1.strip(), Value2.strip(), Value3.strip(), Scope1.strip(), Scope2.strip(), Scope3.strip())
+        (Value1, Value2, Value3, Scope1, Scope2, Scope3) = (Value1.strip(), Value2.strip(), Value3.strip(), intern(Scope1.strip()), intern(Scope2.strip()), intern(Scope3.strip()))
         self.ID = self.ID + self._ID_STEP_
 
         row = DscLine(
@@ -335,9 +419,16 @@ class PlatformTable(MetaFileTable):
                 Included.strip(),
                 Enabled
         )
-        self.CurrentContent.append(row)
+        self._AddRecord(row)
         return self.ID
 
+    ## Add a record built by Insert() to the table and to the indexes of the table
+    #
+    def _AddRecord(self, row):
+        MetaFileTable._AddRecord(self, row)
+        self._RowIndex[row.ID] = row
+        self._ChildIndex[row.BelongsToItem].append(row)
+
 
     ## Query table
     #
@@ -349,36 +440,32 @@ class PlatformTable(MetaFileTable):
     #
     # @retval:       A recordSet of all found records
     #
-    def Query(self, Model, Scope1=None, Scope2=None, BelongsToItem=None, FromItem=None):
+    def _Query(self, Model, Scope1=None, Scope2=None, BelongsToItem=None, FromItem=None):
 
-        QueryTab = self.CurrentContent
-        result = [item for item in QueryTab if item.Model == Model and item.Enabled ]
+        # the records of one item are far fewer than those of one model
+        if BelongsToItem is not None and BelongsToItem >= 0:
+            Records = self._ChildIndex.get(BelongsToItem, ())
+        else:
+            Records = self._ModelIndex.get(Model, ())
+        Sc1 = None
         if Scope1 is not None and Scope1 != DT.TAB_ARCH_COMMON:
-            Sc1 = set(['COMMON'])
-            Sc1.add(Scope1)
-            result = [item for item in result if item.Scope1 in Sc1]
-        Sc2 = set( ['COMMON','DEFAULT'])
+            Sc1 = ArchScopeSet(Scope1)
+        Sc2 = None
         if Scope2 and Scope2 != DT.TAB_COMMON:
-            if '.' in Scope2:
-                Index = Scope2.index('.')
-                NewScope = DT.TAB_COMMON + Scope2[Index:]
-                Sc2.add(NewScope)
-            Sc2.add(Scope2)
-            result = [item for item in result if item.Scope2 in Sc2]
-
-        if BelongsToItem is not None:
-            result = [item for item in result if item.BelongsToItem == BelongsToItem]
-        else:
-            result = [item for item in result if item.BelongsToItem < 0]
-        if FromItem is not None:
-            result = [item for item in result if item.FromItem == FromItem]
+            Sc2 = DscScope2Set(Scope2)
 
-        return result
+        return [item for item in Records if item.Model == Model and item.Enabled
+                and (Sc1 is None or item.Scope1 in Sc1)
+                and (Sc2 is None or item.Scope2 in Sc2)
+                and (item.BelongsToItem == BelongsToItem if BelongsToItem is not None else item.BelongsToItem < 0)
+                and (FromItem is None or item.FromItem == FromItem)]
 
     def DisableComponent(self,comp_id):
-        for item in self.CurrentContent:
-            if item.ID == comp_id or item.BelongsToItem == comp_id:
-                item.Enabled = False
+        if comp_id in self._RowIndex:
+            self._RowIndex[comp_id].Enabled = False
+        for item in self._ChildIndex.get(comp_id, ()):
+            item.Enabled = False
+        self._QueryCache.clear()
 
 ## Factory class to produce different storage for different type of meta-file
 class MetaFileStorage(object):
@@ -397,15 +484,15 @@ class MetaFileStorage(object):
     _ObjectCache = {}
     ## Constructor
     def __new__(cls, MetaFile, FileType=None, Temporary=False, FromItem=None):
+        # temporary storage is never cached
+        if not Temporary:
+            key = (MetaFile.Path, FileType, FromItem)
+            reval = cls._ObjectCache.get(key)
+            if reval is not None:
+                return reval
         # no type given, try to find one
-        key = (MetaFile.Path, FileType,Temporary,FromItem)
-        if key in cls._ObjectCache:
-            return cls._ObjectCache[key]
         if not FileType:
-            if MetaFile.Type in cls._FILE_TYPE_:
-                FileType = cls._FILE_TYPE_[MetaFile.Type]
-            else:
-                FileType = MODEL_FILE_OTHERS
+            FileType = cls._FILE_TYPE_.get(MetaFile.Type, MODEL_FILE_OTHERS)
 
         # create the storage object and return it to caller
         reval = cls._FILE_TABLE_[FileType]()